@@ -1,16 +1,63 @@
-from fastapi import FastAPI
-from pydantic import BaseModel
-import pandas as pd
+from fastapi import Depends, FastAPI, Header, HTTPException, Request
+from pydantic import BaseModel, ConfigDict, Field
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import StreamingResponse
 import json
 import asyncio
+import hmac
+import os
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
 from core.evaluator import (
     evaluate_student_fast_phase,
     evaluate_student_llm_phase
 )
+from utils.submission_store import SubmissionStore
+from utils.results_store import failure_reason_summary
 
-app = FastAPI()
+# -------------------------
+# Evaluation concurrency
+# -------------------------
+# The FAST and LLM phases block on HTTP and Gemini, so they run on a
+# bounded thread pool and the event loop stays free for other streams
+API_EVAL_WORKERS = int(os.getenv("API_EVAL_WORKERS", "16"))
+
+# Rows evaluated at once across every client; the rest wait for a slot
+API_MAX_CONCURRENT_EVALUATIONS = int(os.getenv("API_MAX_CONCURRENT_EVALUATIONS", "16"))
+
+evaluation_executor = ThreadPoolExecutor(
+    max_workers=API_EVAL_WORKERS,
+    thread_name_prefix="api-eval"
+)
+evaluation_slots = asyncio.Semaphore(API_MAX_CONCURRENT_EVALUATIONS)
+
+# Shared secret for POST /submissions; without it the endpoint is off
+SUBMISSIONS_API_TOKEN = os.getenv("SUBMISSIONS_API_TOKEN", "")
+
+
+async def run_evaluation(fn, *args):
+    """
+    Run one blocking evaluation step off the event loop. If the client
+    disconnects, the await is cancelled: a row still waiting for a slot
+    gives it up, and a step already running finishes in its thread but
+    its result is dropped.
+    """
+
+    async with evaluation_slots:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(evaluation_executor, fn, *args)
+
+
+@asynccontextmanager
+async def lifespan(app):
+    submission_store.start_polling()
+    yield
+    submission_store.stop_polling()
+    evaluation_executor.shutdown(wait=False, cancel_futures=True)
+
+
+app = FastAPI(lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -21,9 +68,11 @@ app.add_middleware(
 )
 
 # -------------------------
-# Load submission file ONCE
+# Submissions indexed by roll number
 # -------------------------
-submission_df = pd.read_csv("submission2.csv")
+# Loaded once; rows appended to the CSV (by the form export or
+# POST /submissions) are picked up incrementally by a poller thread
+submission_store = SubmissionStore()
 
 
 class StudentQuery(BaseModel):
@@ -31,12 +80,144 @@ class StudentQuery(BaseModel):
     full_name: str
 
 
+class SubmissionIn(BaseModel):
+    model_config = ConfigDict(populate_by_name=True)
+
+    timestamp: str | None = Field(None, alias="Timestamp")
+    email: str = Field("", alias="Email Address")
+    full_name: str = Field(alias="Full Name")
+    roll_number: str = Field(alias="Roll Number")
+    certificate_link: str = Field(alias="Coursera completion certificate link")
+    linkedin_link: str = Field(alias="LinkedIn Post Link")
+
+
+def require_submissions_token(authorization: str | None = Header(None)):
+
+    if not SUBMISSIONS_API_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+
+    scheme, _, token = (authorization or "").partition(" ")
+
+    if scheme.lower() != "bearer" or not hmac.compare_digest(
+        token.encode("utf-8"), SUBMISSIONS_API_TOKEN.encode("utf-8")
+    ):
+        raise HTTPException(
+            status_code=401,
+            detail="Invalid or missing token",
+            headers={"WWW-Authenticate": "Bearer"}
+        )
+
+
+@app.post("/submissions", dependencies=[Depends(require_submissions_token)])
+async def ingest_submissions(submissions: list[SubmissionIn]):
+
+    now = datetime.now()
+
+    records = []
+
+    for submission in submissions:
+        record = submission.model_dump(by_alias=True)
+
+        # Same format as the Google Form export
+        record["Timestamp"] = record["Timestamp"] or (
+            f"{now.month}/{now.day}/{now.year} {now.hour}:{now.minute:02d}:{now.second:02d}"
+        )
+        records.append(record)
+
+    added = await asyncio.to_thread(submission_store.append_records, records)
+
+    return {
+        "ingested": added,
+        "total": len(submission_store.snapshot.df)
+    }
+
+
+@app.get("/results/failure-reasons")
+async def failure_reasons(since: str | None = None, until: str | None = None):
+    """Non-PASS rows per failure reason across stored runs (run dates since..until, YYYY-MM-DD)."""
+
+    reasons = await asyncio.to_thread(failure_reason_summary, since, until)
+
+    return {
+        "since": since,
+        "until": until,
+        "reasons": reasons
+    }
+
+
+def sse_event(payload):
+    return f"data: {json.dumps(payload)}\n\n"
+
+
+async def evaluate_row(idx, row, request, events):
+    """Evaluate one submission, putting status payloads on events as it goes."""
+
+    try:
+        # 2️⃣ Evaluating
+        await events.put({
+            "row_id": idx,
+            "status": "Evaluating"
+        })
+
+        # 3️⃣ FAST PHASE
+        fast_result = await run_evaluation(evaluate_student_fast_phase, row)
+
+        # -------------------------
+        # Completed in FAST phase
+        # -------------------------
+        if fast_result["phase"] == "completed":
+
+            await events.put({
+                "row_id": idx,
+                "status": "Completed",
+                "result": fast_result["result"].to_api()
+            })
+            return
+
+        # -------------------------
+        # LLM REQUIRED
+        # -------------------------
+        if fast_result["phase"] == "llm_required":
+
+            # Notify frontend slow validation
+            await events.put({
+                "row_id": idx,
+                "status": "LLM Validation (may take 1-2 minutes)"
+            })
+
+            # Don't spend Gemini quota on a stream nobody reads
+            if await request.is_disconnected():
+                return
+
+            # Run LLM
+            final_result = await run_evaluation(
+                evaluate_student_llm_phase,
+                fast_result["data"]
+            )
+
+            await events.put({
+                "row_id": idx,
+                "status": "Completed",
+                "result": final_result.to_api()
+            })
+
+    except Exception as e:
+        # One broken row must not end the other rows' stream
+        await events.put({
+            "row_id": idx,
+            "status": "Error",
+            "error": str(e)
+        })
+
+    finally:
+        # Row finished (or was cancelled)
+        events.put_nowait(None)
+
+
 @app.get("/evaluate-stream/{roll_number}")
-async def evaluate_stream(roll_number: str):
+async def evaluate_stream(roll_number: str, request: Request):
 
-    matches = submission_df[
-        submission_df["Roll Number"].astype(str) == roll_number
-    ].reset_index(drop=True)
+    matches = submission_store.rows_for(roll_number)
 
     # -------------------------
     # No records found
@@ -44,7 +225,7 @@ async def evaluate_stream(roll_number: str):
     if matches.empty:
         async def error_stream():
             payload = {"error": "Roll number not found"}
-            yield f"data: {json.dumps(payload)}\n\n"
+            yield sse_event(payload)
         return StreamingResponse(error_stream(), media_type="text/event-stream")
 
     # -------------------------
@@ -52,71 +233,40 @@ async def evaluate_stream(roll_number: str):
     # -------------------------
     async def event_generator():
 
-        for idx, row in matches.iterrows():
-
-            # 1️⃣ Queued
-            payload = {
+        # 1️⃣ Queued
+        for idx in range(len(matches)):
+            yield sse_event({
                 "row_id": idx,
                 "status": "Queued"
-            }
-            yield f"data: {json.dumps(payload)}\n\n"
-            await asyncio.sleep(0.1)
+            })
 
-            # 2️⃣ Evaluating
-            payload = {
-                "row_id": idx,
-                "status": "Evaluating"
-            }
-            yield f"data: {json.dumps(payload)}\n\n"
-            await asyncio.sleep(0.1)
-
-            # 3️⃣ FAST PHASE
-            fast_result = evaluate_student_fast_phase(row)
-
-            # -------------------------
-            # Completed in FAST phase
-            # -------------------------
-            if fast_result["phase"] == "completed":
-
-                payload = {
-                    "row_id": idx,
-                    "status": "Completed",
-                    "result": fast_result["result"]
-                }
-
-                yield f"data: {json.dumps(payload)}\n\n"
-                await asyncio.sleep(0.2)
-                continue
-
-            # -------------------------
-            # LLM REQUIRED
-            # -------------------------
-            if fast_result["phase"] == "llm_required":
-
-                # Notify frontend slow validation
-                payload = {
-                    "row_id": idx,
-                    "status": "LLM Validation (may take 1-2 minutes)"
-                }
-                yield f"data: {json.dumps(payload)}\n\n"
-                await asyncio.sleep(0.2)
-
-                # Run LLM
-                final_result = evaluate_student_llm_phase(
-                    fast_result["data"]
-                )
-
-                payload = {
-                    "row_id": idx,
-                    "status": "Completed",
-                    "result": final_result
-                }
-
-                yield f"data: {json.dumps(payload)}\n\n"
-                await asyncio.sleep(0.2)
+        # Every row runs at once; events go out in completion order,
+        # so the stream takes about as long as its slowest row
+        events = asyncio.Queue()
+        tasks = [
+            asyncio.create_task(evaluate_row(idx, row, request, events))
+            for idx, row in matches.iterrows()
+        ]
+
+        remaining = len(tasks)
+
+        try:
+            while remaining:
+
+                payload = await events.get()
+
+                if payload is None:
+                    remaining -= 1
+                    continue
+
+                yield sse_event(payload)
+
+        finally:
+            # Client went away: stop rows still waiting for a slot
+            for task in tasks:
+                task.cancel()
 
         # Stream finished
-        payload = {"done": True}
-        yield f"data: {json.dumps(payload)}\n\n"
+        yield sse_event({"done": True})
 
     return StreamingResponse(event_generator(), media_type="text/event-stream")
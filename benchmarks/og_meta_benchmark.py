@@ -0,0 +1,74 @@
+"""
+Micro-benchmark: head-only og: extraction vs. the full BeautifulSoup parse.
+
+Usage:
+    python -m benchmarks.og_meta_benchmark [page.html ...]
+
+Pass saved Coursera / LinkedIn pages to benchmark them. Without
+arguments a synthetic LinkedIn-sized post page is used.
+"""
+
+import sys
+import time
+
+from utils.og_meta import extract_og_meta, parse_og_meta_full
+
+
+def synthetic_linkedin_page():
+
+    head = """<!DOCTYPE html><html lang="en"><head>
+<meta charset="utf-8">
+<title>Jane Doe on LinkedIn: #coursera #python</title>
+<meta property="og:title" content="Jane Doe on LinkedIn: #coursera #python">
+<meta property="og:description" content="Excited to share that I completed the guided project &quot;Mastering Data Analysis with Pandas&quot; on Coursera &amp; built a full EDA pipeline.">
+<meta property="og:image" content="https://media.licdn.com/image.png">
+<meta property="og:type" content="article">
+<meta property="og:url" content="https://www.linkedin.com/posts/jane-doe_activity-1">
+""" + "<link rel=\"stylesheet\" href=\"/static/app.css\">\n" * 40 + "</head>"
+
+    comment = (
+        "<div class=\"comment\"><span class=\"actor\">Someone</span>"
+        "<p>Congratulations! Great work on this project.</p></div>\n"
+    )
+
+    body = "<body><main>" + comment * 3000 + "</main></body></html>"
+
+    return head + body
+
+
+def time_it(fn, page, rounds):
+
+    start = time.perf_counter()
+
+    for _ in range(rounds):
+        fn(page)
+
+    return (time.perf_counter() - start) / rounds * 1000
+
+
+def main(paths):
+
+    if paths:
+        pages = {}
+        for path in paths:
+            with open(path, encoding="utf-8", errors="replace") as f:
+                pages[path] = f.read()
+    else:
+        pages = {"synthetic-linkedin-post": synthetic_linkedin_page()}
+
+    for name, page in pages.items():
+
+        assert extract_og_meta(page) == parse_og_meta_full(page), name
+
+        rounds = 20
+        full_ms = time_it(parse_og_meta_full, page, rounds)
+        head_ms = time_it(extract_og_meta, page, rounds)
+
+        print(f"{name} ({len(page) / 1024:.0f} KB)")
+        print(f"  full BeautifulSoup parse : {full_ms:8.2f} ms")
+        print(f"  head-only extractor      : {head_ms:8.2f} ms")
+        print(f"  speedup                  : {full_ms / head_ms:8.1f}x")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,89 @@
+"""
+Benchmark: similarity prefilter thresholds vs. historical LLM verdicts.
+
+Usage:
+    python -m benchmarks.prefilter_benchmark [Final_Evaluation.csv ...]
+
+Without arguments every data/outputs/Final_Evaluation_*.csv is used.
+Rows the LLM decided (an LLM Reason is stored) are re-scored with the
+prefilter, using the stored post text or, failing that, the LLM Reason
+that quotes it, and compared with the LLM's verdict. Each title is
+also scored against the other rows' texts as a non-match control, and
+a range of ACCEPT / REJECT thresholds is swept over both sets.
+"""
+
+import sys
+
+from benchmarks.project_matcher_benchmark import TEXT_COLUMNS, load_outputs
+from utils.similarity_prefilter import (
+    PREFILTER_ACCEPT,
+    PREFILTER_REJECT,
+    SimilarityPrefilter,
+)
+
+
+def llm_decided_rows(df):
+
+    if "LLM Reason" not in df.columns:
+        return None, df.iloc[0:0]
+
+    decided = df[df["LLM Reason"].notna()]
+    text_column = next(c for c in TEXT_COLUMNS if c in decided.columns and decided[c].notna().any())
+
+    return text_column, decided[decided[text_column].notna()]
+
+
+def sweep(prefilter, positives, negatives):
+
+    positive_scores = prefilter.score_batch(positives)
+    negative_scores = prefilter.score_batch(negatives)
+
+    print("  threshold | LLM matches decided locally as FAIL | non-matches decided locally as PASS")
+
+    for threshold in (0.15, 0.25, 0.35, 0.5, 0.6, 0.7, 0.8, 0.9):
+        false_rejects = int((positive_scores <= threshold).sum())
+        false_accepts = int((negative_scores >= threshold).sum())
+
+        print(
+            f"  {threshold:9.2f} | REJECT: {false_rejects:3d}/{len(positives):<3d}"
+            f"                        | ACCEPT: {false_accepts:4d}/{len(negatives)}"
+        )
+
+
+def main(paths):
+
+    paths, df = load_outputs(paths)
+    print("outputs:", ", ".join(paths))
+
+    text_column, decided = llm_decided_rows(df)
+
+    if decided.empty:
+        print("no LLM-decided rows with text in these outputs")
+        return
+
+    matches = decided[decided["LLM Context Match"] == True]  # noqa: E712
+    print(
+        f"LLM-decided rows: {len(decided)} (scored on {text_column!r}) | "
+        f"LLM match: {len(matches)} | LLM non-match: {len(decided) - len(matches)}"
+    )
+
+    prefilter = SimilarityPrefilter(df["Coursera Project"].dropna().unique())
+
+    pairs = list(zip(decided["Coursera Project"], decided[text_column]))
+    for (decision, score), llm_match in zip(prefilter.classify_batch(pairs), decided["LLM Context Match"]):
+        print(f"  score {score:.2f} -> {decision:<9} | LLM: {'match' if llm_match else 'no match'}")
+
+    # Each title against the other titles' texts: known non-matches
+    negatives = [
+        (title, text)
+        for title in decided["Coursera Project"].unique()
+        for other, text in pairs
+        if other != title
+    ]
+
+    print(f"current thresholds: ACCEPT {PREFILTER_ACCEPT} | REJECT {PREFILTER_REJECT}")
+    sweep(prefilter, pairs, negatives)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
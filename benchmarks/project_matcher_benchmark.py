@@ -0,0 +1,152 @@
+"""
+Benchmark: fuzzy project-title matcher vs. the old substring check.
+
+Usage:
+    python -m benchmarks.project_matcher_benchmark [Final_Evaluation.csv ...]
+
+Without arguments every data/outputs/Final_Evaluation_*.csv is used.
+Rows whose substring check failed are the ones that went to the LLM.
+When an output file carries the post text (or an LLM Reason quoting
+it), those rows are re-scored to count the LLM calls the matcher would
+have avoided. Most outputs keep neither, so the historical titles
+are also run through typical post rewrites (punctuation, "&" / "and",
+plurals, hashtags, emoji). Each title is also checked against the
+other titles' posts as a false-positive control.
+"""
+
+import glob
+import os
+import re
+import sys
+import time
+
+import pandas as pd
+
+from utils.project_matcher import PROJECT_MATCH_THRESHOLD, ProjectMatcher, get_matcher
+
+
+TEXT_COLUMNS = ("LinkedIn Description", "LLM Reason")
+
+
+def load_outputs(paths):
+
+    paths = paths or sorted(glob.glob(os.path.join("data", "outputs", "Final_Evaluation_*.csv")))
+    frames = [pd.read_csv(path) for path in paths]
+
+    return paths, pd.concat(frames, ignore_index=True)
+
+
+def substring_match(text, title):
+    return title.lower() in text.lower()
+
+
+def post_variants(title):
+
+    words = title.split()
+    camel = "".join(w[:1].upper() + w[1:] for w in (re.sub(r"\W", "", w) for w in words))
+    plural = title if title.endswith("s") else title + "s"
+
+    return [
+        f"Just completed \"{title}\" on Coursera 🎉🚀",
+        f"Completed {title.replace(' and ', ' & ')} today",
+        f"Completed {title.replace(' & ', ' and ')} today",
+        f"Wrapped up {title.lower().replace(':', ' -')}!",
+        f"Happy to share my certificate #{camel} #coursera",
+        f"#{camel.lower()} done ✅",
+        f"Finished {plural}",
+    ]
+
+
+def rescore_historical(df):
+
+    sent_to_llm = df[df["Project Mention Match"] == False]  # noqa: E712
+    text_column = next(
+        (c for c in TEXT_COLUMNS if c in df.columns and sent_to_llm[c].notna().any()),
+        None
+    )
+
+    print(f"historical rows: {len(df)} | sent to LLM (substring miss): {len(sent_to_llm)}")
+
+    if text_column is None:
+        print("  no post text stored in these outputs; see the rewrite benchmark below")
+        return
+
+    scored = sent_to_llm[sent_to_llm[text_column].notna()]
+    avoided = 0
+    agree = 0
+
+    for _, row in scored.iterrows():
+        if get_matcher(row["Coursera Project"]).matches(row[text_column]):
+            avoided += 1
+            agree += row["Final Verdict"] == "PASS"
+
+    print(f"  rescored on {text_column!r}: {len(scored)} rows")
+    print(f"  LLM calls avoided: {avoided} ({agree} agree with the LLM's PASS)")
+
+
+def rewrite_benchmark(titles):
+
+    substring_hits = matcher_hits = total = 0
+    false_positives = negatives = 0
+
+    posts = {title: post_variants(title) for title in titles}
+
+    for title in titles:
+
+        matcher = get_matcher(title)
+
+        for post in posts[title]:
+            total += 1
+            substring_hits += substring_match(post, title)
+            matcher_hits += matcher.matches(post)
+
+        for other in titles:
+            if other == title:
+                continue
+            for post in posts[other][:1]:
+                negatives += 1
+                false_positives += matcher.matches(post)
+
+    print(f"rewritten posts for {len(titles)} historical titles: {total}")
+    print(f"  substring check matches : {substring_hits}")
+    print(f"  fuzzy matcher matches   : {matcher_hits} (threshold {PROJECT_MATCH_THRESHOLD})")
+    print(f"  LLM calls avoided       : {matcher_hits - substring_hits}")
+    print(f"  false positives         : {false_positives}/{negatives} other-title posts")
+
+    return posts
+
+
+def timing_benchmark(titles, posts, rounds=20):
+
+    pairs = [(title, post) for title in titles for post in posts[title]]
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for title, post in pairs:
+            get_matcher(title).score(post)
+    compiled_us = (time.perf_counter() - start) / (rounds * len(pairs)) * 1e6
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for title, post in pairs:
+            ProjectMatcher(title).score(post)
+    uncached_us = (time.perf_counter() - start) / (rounds * len(pairs)) * 1e6
+
+    print(f"  per-row score (compiled title) : {compiled_us:8.1f} us")
+    print(f"  per-row score (title rebuilt)  : {uncached_us:8.1f} us")
+
+
+def main(paths):
+
+    paths, df = load_outputs(paths)
+    print("outputs:", ", ".join(paths))
+
+    rescore_historical(df)
+
+    titles = sorted(df["Coursera Project"].dropna().unique())
+    posts = rewrite_benchmark(titles)
+    timing_benchmark(titles, posts)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -1,6 +1,7 @@
 from tools.coursera_tool import verify_coursera_certificate
 from tools.linkedin_tool import get_linkedin_observations
-from utils.context_project_match import llm_project_context_match
+from utils.context_project_match import LLMUnavailableError, llm_project_context_match
+from utils.result_record import ResultRecord
 
 
 def evaluate_student_fast_phase(row: dict):
@@ -20,12 +21,12 @@ def evaluate_student_fast_phase(row: dict):
     if coursera_data.get("Cert_Status") == "Fail":
         return {
             "phase": "completed",
-            "result": {
-                "roll_number": roll,
-                "full_name": full_name,
-                "verdict": "INVALID",
-                "reason": "Coursera link is invalid."
-            }
+            "result": ResultRecord(
+                roll,
+                full_name,
+                final_verdict="INVALID",
+                failure_reason="Coursera link is invalid."
+            )
         }
 
     coursera_project = coursera_data.get("coursera_project_name")
@@ -44,14 +45,15 @@ def evaluate_student_fast_phase(row: dict):
     if linkedin_data.get("project_match"):
         return {
             "phase": "completed",
-            "result": {
-                "roll_number": roll,
-                "full_name": full_name,
-                "project": coursera_project,
-                "completion_date": completion_date,
-                "verdict": "PASS",
-                "reason": ""
-            }
+            "result": ResultRecord(
+                roll,
+                full_name,
+                coursera_project=coursera_project,
+                completion_date=completion_date,
+                project_mention_match=True,
+                final_verdict="PASS",
+                project_match_score=linkedin_data.get("project_match_score")
+            )
         }
 
     # If fast match failed → need LLM
@@ -62,32 +64,52 @@ def evaluate_student_fast_phase(row: dict):
             "full_name": full_name,
             "project": coursera_project,
             "completion_date": completion_date,
+            "project_match_score": linkedin_data.get("project_match_score"),
             "linkedin_description": linkedin_data.get("linkedin_description", "")
         }
     }
 
 def evaluate_student_llm_phase(data: dict):
 
-    llm_result = llm_project_context_match(
-        data["project"],
-        data["linkedin_description"]
+    result = ResultRecord(
+        data["roll"],
+        data["full_name"],
+        coursera_project=data["project"],
+        completion_date=data["completion_date"],
+        project_mention_match=False,
+        project_match_score=data.get("project_match_score")
     )
 
-    if llm_result.get("match"):
-        return {
-            "roll_number": data["roll"],
-            "full_name": data["full_name"],
-            "project": data["project"],
-            "completion_date": data["completion_date"],
-            "verdict": "PASS",
-            "reason": f"LLM Context Match ({llm_result.get('confidence', 0)}%)"
-        }
+    # No LLM answer is not a verdict: report it instead of a FAIL
+    try:
+        llm_result = llm_project_context_match(
+            data["project"],
+            data["linkedin_description"],
+            raise_errors=True
+        )
 
-    return {
-        "roll_number": data["roll"],
-        "full_name": data["full_name"],
-        "project": data["project"],
-        "completion_date": data["completion_date"],
-        "verdict": "FAIL",
-        "reason": "LinkedIn post does not mention the Coursera project."
-    }
+    except LLMUnavailableError as e:
+        result.final_verdict = "PENDING"
+        result.failure_reason = f"LLM validation skipped: {e}"
+        result.llm_status = "skipped"
+        return result
+
+    except Exception as e:
+        result.final_verdict = "ERROR"
+        result.failure_reason = f"LLM validation failed: {e}"
+        result.llm_status = "error"
+        return result
+
+    result.llm_context_match = bool(llm_result.get("match"))
+    result.llm_confidence = llm_result.get("confidence", 0)
+    result.llm_status = "ok"
+    result.prompt_version = llm_result.get("prompt_version")
+
+    if result.llm_context_match:
+        result.final_verdict = "PASS"
+        result.failure_reason = f"LLM Context Match ({result.llm_confidence}%)"
+    else:
+        result.final_verdict = "FAIL"
+        result.failure_reason = "LinkedIn post does not mention the Coursera project."
+
+    return result
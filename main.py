@@ -1,19 +1,56 @@
-import pandas as pd
+import argparse
+import asyncio
 import os
+import random
 import threading
+import time
 
-from queue import Queue
-from concurrent.futures import ThreadPoolExecutor
+from queue import Queue, Empty
 
 from tools.coursera_tool import verify_coursera_certificate
+from tools.coursera_tool import verify_coursera_certificate_async
+from tools.coursera_tool import get_name_match_stats
+from tools.coursera_tool import page_flights
 from tools.linkedin_tool import get_linkedin_observations
+from tools.linkedin_tool import get_linkedin_observations_async
+from tools.linkedin_tool import snapshot_flights
 from utils.context_project_match import llm_project_context_match
-
-from utils.google_sheet_logger import init_sheet
-from utils.google_sheet_logger import append_result_live
+from utils.context_project_match import llm_project_context_match_batch
+from utils.context_project_match import rate_limiter
+from utils.context_project_match import LLMUnavailableError
+from utils.rate_limiter import RetryScheduler
+from utils.similarity_prefilter import SimilarityPrefilter
+from utils.similarity_prefilter import PREFILTER_ENABLED
+from utils.similarity_prefilter import DECISION_AMBIGUOUS, DECISION_MATCH
+from utils.similarity_prefilter import get_prefilter_stats
+from utils.project_catalog import get_project_catalog
+from utils.project_catalog import load_catalog_titles
+
+from utils.result_sinks import init_result_sink
+from utils.result_sinks import append_result_live
+from utils.result_sinks import flush_results_live
+from utils.result_sinks import set_result_sink
+
+from utils.http_client import AsyncHttpClient
+from utils.http_client import ASYNC_MAX_IN_FLIGHT
+from utils.http_client import format_http_stats
+from utils.response_cache import get_cache_stats, set_cache_bypass
+from utils.llm_cache import get_llm_cache_stats
+
+from utils.checkpoint_store import CheckpointStore
+from utils.checkpoint_store import STATUS_LLM_PENDING
+from utils.checkpoint_store import STATUS_FETCH_ERROR
+from utils.checkpoint_store import submission_fingerprint
+from utils.certificate_index import CertificateIndex, certificate_key
+from utils.url_canonical import canonical_coursera_url, canonical_linkedin_url
+from utils.submission_reader import iter_submissions
+from utils.result_record import ResultRecord, write_results
+from utils.results_store import append_run, new_run_id
+from utils.context_project_match import GEMINI_MODEL, LLM_BACKEND
 
 
 llm_queue = Queue()
+prefilter_queue = Queue()
 results_lock = threading.Lock()
 
 fast_completed = 0
@@ -21,6 +58,52 @@ llm_completed = 0
 
 counter_lock = threading.Lock()
 
+# Set by run_pipeline; every finished row is recorded here
+checkpoints = None
+
+# How long a batching LLM worker waits to fill a batch
+LLM_BATCH_WINDOW_MS = int(os.getenv("LLM_BATCH_WINDOW_MS", "200"))
+
+# LLM workers start at LLM_MIN_WORKERS and the autoscaler adds more,
+# up to LLM_MAX_WORKERS, while the rate limiter's quota allows it
+LLM_MIN_WORKERS = int(os.getenv("LLM_MIN_WORKERS", "2"))
+LLM_MAX_WORKERS = int(os.getenv("LLM_MAX_WORKERS", "8"))
+
+# Failed Gemini calls are re-queued with exponential backoff + jitter
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "5"))
+LLM_RETRY_BASE_SECONDS = float(os.getenv("LLM_RETRY_BASE_SECONDS", "2"))
+
+# Rows waiting for the LLM are first scored locally in micro-batches
+PREFILTER_BATCH_SIZE = int(os.getenv("PREFILTER_BATCH_SIZE", "64"))
+PREFILTER_WINDOW_MS = int(os.getenv("PREFILTER_WINDOW_MS", "100"))
+
+# Submissions are streamed from the CSV to the FAST workers through a
+# bounded queue, so reading never runs far ahead of evaluation
+FAST_WORKERS = int(os.getenv("FAST_WORKERS", "4"))
+FAST_ASYNC_CONCURRENCY = int(os.getenv("FAST_ASYNC_CONCURRENCY", str(ASYNC_MAX_IN_FLIGHT)))
+FAST_QUEUE_SIZE = int(os.getenv("FAST_QUEUE_SIZE", "64"))
+
+# Links are canonicalized before any fetch; in strict mode a link that
+# is not a certificate / LinkedIn post is rejected without a request
+PREFLIGHT_STRICT = os.getenv("PREFLIGHT_STRICT", "1") == "1"
+
+# Set by run_pipeline while the LLM phase is running
+retry_scheduler = None
+prefilter = None
+
+llm_attempts = {}
+llm_retries = 0
+llm_exhausted = 0
+llm_skipped = 0
+cross_project_rows = 0
+duplicates_before_fetch = 0
+fetch_errors = 0
+row_errors = 0
+
+NOT_MENTIONED_REASON = "LinkedIn post does not mention the Coursera project."
+
+INVALID_LINKEDIN_REASON = "LinkedIn link is not a LinkedIn post."
+
 
 # -------------------------
 # DEBUG STATUS LOGGER
@@ -29,38 +112,174 @@ def debug_status(prefix, message):
     print(f"[{prefix}] {message}")
 
 
+# -------------------------
+# CHECKPOINT HELPERS
+# -------------------------
+def checkpoint_done(fingerprint, result):
+    if checkpoints is not None:
+        checkpoints.mark_done(fingerprint, result.to_dict())
+
+
+def checkpoint_llm_pending(fingerprint, result, llm_task):
+    if checkpoints is not None:
+        checkpoints.mark_llm_pending(fingerprint, result.to_dict(), llm_task)
+
+
+def checkpoint_fetch_error(fingerprint, result):
+    if checkpoints is not None:
+        checkpoints.mark_fetch_error(fingerprint, result.to_dict())
+
+
+def not_mentioned_reason(result):
+
+    other_projects = result.other_projects
+
+    if other_projects:
+        return f"LinkedIn post describes a different project: {other_projects}"
+
+    return NOT_MENTIONED_REASON
+
+
 # Handle the Invalid Coursera Links Submissions
 def handle_invalid_coursera_link(index, row, results):
+    handle_invalid_link(index, row, results, "Coursera link is invalid.")
+
+
+# A link that can never be evaluated: final, not retried on the next run
+def handle_invalid_link(index, row, results, reason):
 
     global fast_completed
 
-    roll = row["Roll Number"]
-    certificate_link = row["Coursera completion certificate link"].strip()
+    result = ResultRecord(
+        row["Roll Number"],
+        row["Full Name"],
+        final_verdict="INVALID",
+        failure_reason=reason
+    )
 
-    result_entry = {
-        "Roll Number": roll,
-        "Full Name": row["Full Name"],
-        "Coursera Project": '-',
-        "Certificate Completion Date": '-',
-        "Project Mention Match": '-',
-        "Final Verdict": 'INVALID',
-        "Failure Reason": "Coursera link is invalid.",
-        "Duplicate Certificate": False,
-        "LLM Context Match": False,
-        "LLM Confidence": 0,
-    }
+    results[index] = result
+    checkpoint_done(submission_fingerprint(row), result)
+
+    append_result_live(result.output_row())
+
+    with counter_lock:
+        fast_completed += 1
+
+        debug_status(
+            "FAST",
+            f"Completed: {fast_completed} | LLM Queue: {llm_queue.qsize()}"
+        )
+
+
+def duplicate_reason(roll, owner):
+
+    if str(owner[1]) == str(roll):
+        return "Duplicate certificate"
+
+    return f"Duplicate certificate (already submitted by roll {owner[1]})"
+
+
+# Reject a certificate another submission already holds, before any fetch
+def handle_duplicate_certificate(index, row, results, owner):
+
+    global fast_completed, duplicates_before_fetch
 
-    results[index] = result_entry
+    roll = row["Roll Number"]
+    reason = duplicate_reason(roll, owner)
 
-    append_result_live([
+    result = ResultRecord(
         roll,
         row["Full Name"],
-        '-',
-        '-',
-        False,
-        "INVALID",
-        "Coursera link is invalid."
-    ])
+        final_verdict="FAIL",
+        failure_reason=reason,
+        duplicate_certificate=True
+    )
+
+    results[index] = result
+    checkpoint_done(submission_fingerprint(row), result)
+
+    append_result_live(result.output_row())
+
+    with counter_lock:
+        fast_completed += 1
+        duplicates_before_fetch += 1
+
+        debug_status(
+            "FAST",
+            f"Completed: {fast_completed} | LLM Queue: {llm_queue.qsize()}"
+        )
+
+
+# The row holding a certificate is done: rows queued behind it are
+# duplicates if it claimed the certificate, else the next one goes ahead
+def release_certificate(item, results, certificate_index):
+
+    idx, row, _, cert_key = item
+
+    duplicates, owner, next_item = certificate_index.release(cert_key, submission_fingerprint(row))
+
+    for duplicate_idx, duplicate_row, _, _ in duplicates:
+        handle_duplicate_certificate(duplicate_idx, duplicate_row, results, owner)
+
+    return next_item
+
+
+# -------------------------
+# PRE-FLIGHT LINK CHECKS
+# -------------------------
+def preflight_links(row):
+    """
+    (certificate URL, LinkedIn URL) in canonical form, None for a link
+    that is invalid. Outside strict mode unrecognized links are kept
+    as submitted.
+    """
+
+    links = []
+
+    for column, canonical in (
+        ("Coursera completion certificate link", canonical_coursera_url),
+        ("LinkedIn Post Link", canonical_linkedin_url)
+    ):
+        raw = str(row[column]).strip()
+        url = canonical(raw)
+
+        if url is None and not PREFLIGHT_STRICT and raw:
+            url = raw
+
+        links.append(url)
+
+    return tuple(links)
+
+
+def fetch_error_reason(coursera_data, linkedin_data=None):
+    """Why the row could not be evaluated, or None if both fetches worked."""
+
+    if coursera_data.get("Cert_Status") == "Error":
+        return f"Coursera certificate could not be fetched: {coursera_data.get('error')}"
+
+    if linkedin_data is not None and linkedin_data.get("status") == "Fail":
+
+        return f"LinkedIn post could not be fetched: {linkedin_data.get('error')}"
+
+    return None
+
+
+# An ERROR row: reported, but kept retryable on the next run
+def record_error_result(index, row, results, reason):
+
+    global fast_completed
+
+    result = ResultRecord(
+        row["Roll Number"],
+        row["Full Name"],
+        final_verdict="ERROR",
+        failure_reason=reason
+    )
+
+    results[index] = result
+    checkpoint_fetch_error(submission_fingerprint(row), result)
+
+    append_result_live(result.output_row())
 
     with counter_lock:
         fast_completed += 1
@@ -71,115 +290,518 @@ def handle_invalid_coursera_link(index, row, results):
         )
 
 
+# A fetch failed
+def handle_fetch_error(index, row, results, reason):
+
+    global fetch_errors
+
+    record_error_result(index, row, results, reason)
+
+    with counter_lock:
+        fetch_errors += 1
+
+
+# A row raised while being evaluated: keep it in the output as ERROR
+def handle_row_error(index, row, results, error):
+
+    global row_errors
+
+    debug_status("FAST", f"Row {index} ERROR: {error}")
+
+    with counter_lock:
+        row_errors += 1
+
+    # If it failed after its result was recorded, that result stands
+    if index not in results:
+        record_error_result(index, row, results, f"Evaluation error: {error}")
+
+
+def fetch_linkedin_data(linkedin_url, row, coursera_data):
+
+    return get_linkedin_observations(
+        linkedin_url,
+        row["Full Name"],
+        coursera_data.get("coursera_project_name")
+    )
+
+
+async def fetch_linkedin_data_async(client, linkedin_url, row, coursera_data):
+
+    return await get_linkedin_observations_async(
+        client,
+        linkedin_url,
+        row["Full Name"],
+        coursera_data.get("coursera_project_name")
+    )
+
+
 # -------------------------
 # LLM WORKER THREAD
 # -------------------------
-def llm_worker(results):
+def finish_llm_task(results, task, llm_match_result):
+
+    global llm_completed, llm_exhausted, llm_skipped
+
+    index = task[0]
+    fingerprint = task[-1]
+    result = results[index]
+
+    if isinstance(llm_match_result, LLMUnavailableError):
+
+        with counter_lock:
+            llm_attempts.pop(index, None)
+            llm_skipped += 1
+
+        result.final_verdict = "PENDING"
+        result.failure_reason = f"LLM validation skipped: {llm_match_result}"
+        result.llm_status = "skipped"
+
+        # Never evaluated; stays llm_pending so a run with the LLM decides it
+
+    elif isinstance(llm_match_result, Exception):
+
+        with counter_lock:
+            attempts = llm_attempts.pop(index, 1)
+            llm_exhausted += 1
+
+        result.final_verdict = "FAIL"
+        result.failure_reason = f"LLM validation failed after {attempts} attempts: {llm_match_result}"
+        result.llm_status = "retries_exhausted"
+
+        # Stays llm_pending in the checkpoint so the next run retries it
+
+    else:
+
+        with counter_lock:
+            llm_attempts.pop(index, None)
+
+        if llm_match_result["match"]:
+            result.final_verdict = "PASS"
+            result.failure_reason = f"LLM Context Match ({llm_match_result['confidence']}%)"
+        else:
+            result.final_verdict = "FAIL"
+            result.failure_reason = not_mentioned_reason(result)
+
+        result.llm_context_match = llm_match_result["match"]
+        result.llm_confidence = llm_match_result["confidence"]
+        result.llm_status = "ok"
+        result.prompt_version = llm_match_result.get("prompt_version")
+
+        checkpoint_done(fingerprint, result)
+
+    append_result_live(result.output_row())
+
+    llm_queue.task_done()
+
+    # ⭐ LLM COUNTER + STATUS
+    with counter_lock:
+        llm_completed += 1
+
+        debug_status(
+            "LLM",
+            f"Completed: {llm_completed} | Remaining Queue: {llm_queue.qsize()}"
+        )
+
+
+def handle_llm_error(results, task, error):
+    """Re-queue a failed row with backoff, or fail it once retries run out."""
+
+    global llm_retries
 
-    global llm_completed
+    index = task[0]
+
+    with counter_lock:
+        attempt = llm_attempts.get(index, 0) + 1
+        llm_attempts[index] = attempt
+
+    retryable = getattr(error, "retryable", False)
+
+    if retryable and attempt <= LLM_MAX_RETRIES and retry_scheduler is not None:
+
+        delay = LLM_RETRY_BASE_SECONDS * 2 ** (attempt - 1)
+        delay += random.uniform(0, LLM_RETRY_BASE_SECONDS)
+
+        with counter_lock:
+            llm_retries += 1
+
+        debug_status("LLM", f"Retry {attempt}/{LLM_MAX_RETRIES} for {task[1]} in {delay:.1f}s")
+
+        # The scheduler marks this attempt task_done once the retry is queued
+        retry_scheduler.schedule(task, delay)
+        return
+
+    finish_llm_task(results, task, error)
+
+
+def drain_llm_batch(first_task, batch_size, window_seconds, source_queue=llm_queue):
+    """
+    Collect up to batch_size tasks, waiting at most window_seconds for
+    more to arrive. Returns (batch, stop) where stop means a shutdown
+    sentinel was taken from the queue.
+    """
+
+    batch = [first_task]
+    deadline = time.monotonic() + window_seconds
+
+    while len(batch) < batch_size:
+
+        remaining = deadline - time.monotonic()
+
+        if remaining <= 0:
+            break
+
+        try:
+            task = source_queue.get(timeout=remaining)
+        except Empty:
+            break
+
+        if task is None:
+            return batch, True
+
+        batch.append(task)
+
+    return batch, False
+
+
+def llm_worker(results, batch_size=1, batch_window_ms=LLM_BATCH_WINDOW_MS):
 
     debug_status("LLM", "Worker Started")
 
-    while True:
+    stop = False
+
+    while not stop:
 
         task = llm_queue.get()
 
         if task is None:
-            debug_status("LLM", "Worker Stopped")
             break
 
-        index, roll, name, coursera_project, completion_date, linkedin_description = task
+        if batch_size <= 1:
+            batch = [task]
 
-        llm_match_result = llm_project_context_match(
-            coursera_project,
-            linkedin_description
-        )
+            try:
+                llm_match_results = [
+                    llm_project_context_match(task[3], task[5], raise_errors=True)
+                ]
+            except Exception as e:
+                llm_match_results = [e]
 
-        if llm_match_result["match"]:
-            verdict = "PASS"
-            reason = f"LLM Context Match ({llm_match_result['confidence']}%)"
         else:
-            verdict = "FAIL"
-            reason = "LinkedIn post does not mention the Coursera project."
+            batch, stop = drain_llm_batch(task, batch_size, batch_window_ms / 1000)
 
-        results[index]["Final Verdict"] = verdict
-        results[index]["Failure Reason"] = reason
+            llm_match_results = llm_project_context_match_batch(
+                [(t[3], t[5]) for t in batch],
+                raise_errors=True
+            )
 
-        append_result_live([
-            roll,
-            name,
-            coursera_project,
-            completion_date,
-            results[index]["Project Mention Match"],
-            verdict,
-            reason
-        ])
+        for batch_task, llm_match_result in zip(batch, llm_match_results):
 
-        llm_queue.task_done()
+            if isinstance(llm_match_result, Exception):
+                handle_llm_error(results, batch_task, llm_match_result)
+            else:
+                finish_llm_task(results, batch_task, llm_match_result)
 
-        # ⭐ LLM COUNTER + STATUS
-        with counter_lock:
-            llm_completed += 1
+    debug_status("LLM", "Worker Stopped")
 
-            debug_status(
-                "LLM",
-                f"Completed: {llm_completed} | Remaining Queue: {llm_queue.qsize()}"
-            )
+
+# -------------------------
+# LOCAL SIMILARITY PREFILTER
+# -------------------------
+def queue_for_llm(task):
+    """Send a row that failed the exact-substring check towards the LLM."""
+
+    if prefilter is not None:
+        prefilter_queue.put(task)
+    else:
+        llm_queue.put(task)
+
+
+def finish_prefilter_task(results, task, decision, score):
+
+    index = task[0]
+    fingerprint = task[-1]
+    result = results[index]
+
+    if decision == DECISION_MATCH:
+        result.final_verdict = "PASS"
+        result.failure_reason = f"Local similarity match ({score:.0%})"
+    else:
+        result.final_verdict = "FAIL"
+        result.failure_reason = not_mentioned_reason(result)
+
+    result.llm_status = "prefilter"
+
+    checkpoint_done(fingerprint, result)
+
+    append_result_live(result.output_row())
+
+
+def prefilter_worker(results):
+
+    debug_status("PREFILTER", "Worker Started")
+
+    stop = False
+
+    while not stop:
+
+        task = prefilter_queue.get()
+
+        if task is None:
+            break
+
+        batch, stop = drain_llm_batch(
+            task,
+            PREFILTER_BATCH_SIZE,
+            PREFILTER_WINDOW_MS / 1000,
+            source_queue=prefilter_queue
+        )
+
+        decisions = prefilter.classify_batch([(t[3], t[5]) for t in batch])
+
+        for batch_task, (decision, score) in zip(batch, decisions):
+
+            results[batch_task[0]].prefilter_score = round(score, 3)
+
+            if decision == DECISION_AMBIGUOUS:
+                llm_queue.put(batch_task)
+            else:
+                finish_prefilter_task(results, batch_task, decision, score)
+
+            prefilter_queue.task_done()
+
+    debug_status("PREFILTER", "Worker Stopped")
+
+
+def llm_autoscaler(results, workers, batch_size, stop_event):
+    """Add LLM workers while there is a backlog and the quota can feed them."""
+
+    while not stop_event.wait(1.0):
+
+        if llm_queue.qsize() == 0:
+            continue
+
+        target = rate_limiter.target_concurrency(LLM_MAX_WORKERS)
+
+        if len(workers) < target:
+            t = threading.Thread(target=llm_worker, args=(results, batch_size))
+            t.start()
+            workers.append(t)
+
+            debug_status("LLM", f"Scaled up to {len(workers)} workers (target {target})")
 
 
 # -------------------------
 # FAST RECORD PROCESSING
 # -------------------------
-def process_fast_record(index, row, results, seen_certificates_by_roll):
-
-    global fast_completed
+def process_fast_record(index, row, results, certificate_index, links):
 
-    roll = row["Roll Number"]
-    certificate_link = row["Coursera completion certificate link"].strip()
+    certificate_url, linkedin_url = links
 
     coursera_data = verify_coursera_certificate(
-        certificate_link,
+        certificate_url,
         row["Full Name"]
     )
 
-    coursera_project = coursera_data.get("coursera_project_name")
-    completion_date = coursera_data.get("completion_date", "")
-    
+    reason = fetch_error_reason(coursera_data)
+    if reason:
+        handle_fetch_error(index, row, results, reason)
+        return
+
     status = coursera_data.get('Cert_Status')
     if status == 'Fail':
         handle_invalid_coursera_link(index, row, results)
-    
-    linkedin_data = get_linkedin_observations(
-        row["LinkedIn Post Link"],
-        row["Full Name"],
-        coursera_project
+        return
+
+    linkedin_data = fetch_linkedin_data(linkedin_url, row, coursera_data)
+
+    reason = fetch_error_reason(coursera_data, linkedin_data)
+    if reason:
+        handle_fetch_error(index, row, results, reason)
+        return
+
+    record_fast_outcome(
+        index,
+        row,
+        results,
+        certificate_index,
+        links,
+        coursera_data,
+        linkedin_data
+    )
+
+
+# -------------------------
+# FAST RECORD PROCESSING (ASYNCIO)
+# -------------------------
+async def process_fast_record_async(client, index, row, results, certificate_index, links):
+
+    certificate_url, linkedin_url = links
+
+    coursera_data = await verify_coursera_certificate_async(
+        client,
+        certificate_url,
+        row["Full Name"]
+    )
+
+    # Verdict bookkeeping talks to Google Sheets, keep it off the loop
+    reason = fetch_error_reason(coursera_data)
+    if reason:
+        await asyncio.to_thread(handle_fetch_error, index, row, results, reason)
+        return
+
+    if coursera_data.get('Cert_Status') == 'Fail':
+        await asyncio.to_thread(handle_invalid_coursera_link, index, row, results)
+        return
+
+    linkedin_data = await fetch_linkedin_data_async(client, linkedin_url, row, coursera_data)
+
+    reason = fetch_error_reason(coursera_data, linkedin_data)
+    if reason:
+        await asyncio.to_thread(handle_fetch_error, index, row, results, reason)
+        return
+
+    await asyncio.to_thread(
+        record_fast_outcome,
+        index,
+        row,
+        results,
+        certificate_index,
+        links,
+        coursera_data,
+        linkedin_data
     )
 
-    if roll not in seen_certificates_by_roll:
-        seen_certificates_by_roll[roll] = set()
 
-    is_duplicate = certificate_link in seen_certificates_by_roll[roll]
+def fast_worker(fast_queue, results, certificate_index):
+
+    while True:
+
+        item = fast_queue.get()
+
+        if item is None:
+            break
+
+        # A finished row may hand over a row that was waiting on its certificate
+        while item is not None:
+
+            idx, row, links, _ = item
+
+            try:
+                process_fast_record(idx, row, results, certificate_index, links)
+            except Exception as e:
+                handle_row_error(idx, row, results, e)
+
+            item = release_certificate(item, results, certificate_index)
+
+
+async def run_fast_phase_async(ingest, results, certificate_index):
+    """
+    Run ingest(submit) in a thread; rows it submits are evaluated by
+    FAST_ASYNC_CONCURRENCY tasks sharing one client. Returns its result.
+    """
+
+    client = AsyncHttpClient()
+    fast_queue = asyncio.Queue(maxsize=FAST_QUEUE_SIZE)
+    loop = asyncio.get_running_loop()
+
+    def submit(item):
+        asyncio.run_coroutine_threadsafe(fast_queue.put(item), loop).result()
+
+    async def consume():
+        while True:
+
+            item = await fast_queue.get()
+
+            if item is None:
+                return
+
+            while item is not None:
+
+                idx, row, links, _ = item
+
+                try:
+                    await process_fast_record_async(client, idx, row, results, certificate_index, links)
+                except Exception as e:
+                    await asyncio.to_thread(handle_row_error, idx, row, results, e)
+
+                item = await asyncio.to_thread(release_certificate, item, results, certificate_index)
+
+    consumers = [asyncio.create_task(consume()) for _ in range(FAST_ASYNC_CONCURRENCY)]
+
+    try:
+        ingest_stats = await asyncio.to_thread(ingest, submit)
+
+        for _ in consumers:
+            await fast_queue.put(None)
+
+        await asyncio.gather(*consumers)
+
+        return ingest_stats
+
+    finally:
+        for task in consumers:
+            task.cancel()
+
+        await client.aclose()
+
+
+# -------------------------
+# FAST VERDICT BOOKKEEPING
+# -------------------------
+def record_fast_outcome(index, row, results, certificate_index, links, coursera_data, linkedin_data):
+
+    global fast_completed, cross_project_rows
+
+    roll = row["Roll Number"]
+    certificate_link = row["Coursera completion certificate link"].strip()
+    fingerprint = submission_fingerprint(row)
+
+    coursera_project = coursera_data.get("coursera_project_name")
+    completion_date = coursera_data.get("completion_date", "")
+
+    # Claimed on the verify ID the link led to, so share and verify links
+    # of one certificate collide; the share link is remembered as an alias
+    link_key = certificate_key(certificate_link)
+    cert_key = certificate_key(coursera_data.get("final_url"))
+
+    if cert_key is None or not cert_key.startswith("verify:"):
+        cert_key = certificate_index.resolve(link_key)
+
+    certificate_index.add_alias(link_key, cert_key)
 
-    if not is_duplicate:
-        seen_certificates_by_roll[roll].add(certificate_link)
+    # First valid submission of a certificate (any roll, any run) owns it.
+    # If a row reserved the verify ID in pre-flight and is still running,
+    # this row waits for it and is evaluated again (from the cache) after
+    status, owner = certificate_index.claim(cert_key, fingerprint, roll, (index, row, links, cert_key))
+
+    if status == "waiting":
+        return
+
+    is_duplicate = owner is not None
 
     linkedin_description = linkedin_data.get("linkedin_description", "")
 
-    result_entry = {
-        "Roll Number": roll,
-        "Full Name": row["Full Name"],
-        "Coursera Project": coursera_project,
-        "Certificate Completion Date": completion_date,
-        "Project Mention Match": linkedin_data.get("project_match"),
-        "Final Verdict": None,
-        "Failure Reason": "",
-        "Duplicate Certificate": is_duplicate,
-        "LLM Context Match": False,
-        "LLM Confidence": 0,
-    }
+    # One automaton pass finds every known project the post names
+    catalog = get_project_catalog()
+    catalog.add(coursera_project)
+    other_projects = sorted(catalog.other_projects_mentioned(linkedin_description, coursera_project))
+
+    if other_projects:
+        with counter_lock:
+            cross_project_rows += 1
+
+    result = ResultRecord(
+        roll,
+        row["Full Name"],
+        coursera_project=coursera_project,
+        completion_date=completion_date,
+        project_mention_match=linkedin_data.get("project_match"),
+        duplicate_certificate=is_duplicate,
+        project_match_score=linkedin_data.get("project_match_score"),
+        other_projects="; ".join(other_projects)
+    )
 
-    results[index] = result_entry
-    current_index = index
+    results[index] = result
 
     # -------------------------
     # FAST VERDICT LOGIC
@@ -187,43 +809,35 @@ def process_fast_record(index, row, results, seen_certificates_by_roll):
 
     if is_duplicate:
 
-        results[current_index]["Final Verdict"] = "FAIL"
-        results[current_index]["Failure Reason"] = "Duplicate certificate"
+        result.final_verdict = "FAIL"
+        result.failure_reason = duplicate_reason(roll, owner)
 
-        append_result_live([
-            roll,
-            row["Full Name"],
-            coursera_project,
-            completion_date,
-            linkedin_data.get("project_match"),
-            "FAIL",
-            "Duplicate certificate"
-        ])
+        checkpoint_done(fingerprint, result)
+
+        append_result_live(result.output_row())
 
     elif linkedin_data.get("project_match"):
 
-        results[current_index]["Final Verdict"] = "PASS"
+        result.final_verdict = "PASS"
 
-        append_result_live([
-            roll,
-            row["Full Name"],
-            coursera_project,
-            completion_date,
-            linkedin_data.get("project_match"),
-            "PASS",
-            ""
-        ])
+        checkpoint_done(fingerprint, result)
+
+        append_result_live(result.output_row())
 
     else:
 
-        llm_queue.put((
-            current_index,
+        llm_task = (
             roll,
             row["Full Name"],
             coursera_project,
             completion_date,
-            linkedin_description
-        ))
+            linkedin_description,
+            fingerprint
+        )
+
+        checkpoint_llm_pending(fingerprint, result, llm_task)
+
+        queue_for_llm((index, *llm_task))
 
     # ⭐ FAST COUNTER + STATUS
     with counter_lock:
@@ -238,79 +852,376 @@ def process_fast_record(index, row, results, seen_certificates_by_roll):
 # -------------------------
 # MAIN PIPELINE
 # -------------------------
-def run_pipeline(input_filename):
+def ingest_submissions(submissions, results, restored, submit, evaluated, certificate_index):
+    """
+    Resume, pre-flight and hand off each (idx, row) as it is read:
+    restored rows get their checkpointed result, rows with an invalid
+    certificate link or a certificate already owned are rejected, the
+    rest go to submit((idx, row, links, cert_key)) or wait behind an
+    earlier row with the same certificate.
+    Rows (re-)evaluated in this run are recorded as evaluated[idx] = fingerprint.
+    """
+
+    catalog = get_project_catalog()
+
+    stats = {
+        "resumed": 0,
+        "resumed_llm": 0,
+        "new": 0,
+        "invalid_certificates": 0,
+        "invalid_linkedin": 0,
+        "waiting": 0,
+    }
+    certificate_urls = set()
+    linkedin_urls = set()
+
+    for idx, row in submissions:
+
+        # -------------------------
+        # RESUME FROM CHECKPOINTS
+        # -------------------------
+        fingerprint = submission_fingerprint(row)
+        entry = restored.get(fingerprint)
+
+        # Rows whose fetch failed last time are evaluated again
+        if entry is not None and entry[0] != STATUS_FETCH_ERROR:
+            status, result_entry, llm_task = entry
+            results[idx] = ResultRecord.from_dict(result_entry)
+            catalog.add(results[idx].coursera_project)
+            stats["resumed"] += 1
+
+            if status == STATUS_LLM_PENDING:
+                evaluated[idx] = fingerprint
+                queue_for_llm((idx, *llm_task))
+                stats["resumed_llm"] += 1
+
+            continue
+
+        evaluated[idx] = fingerprint
+        stats["new"] += 1
+
+        # -------------------------
+        # PRE-FLIGHT: CANONICAL LINKS
+        # -------------------------
+        # Invalid certificate / LinkedIn links are rejected here without a request;
+        # rows sharing a link share its fetch through the single-flight groups
+        links = preflight_links(row)
+        certificate_url, linkedin_url = links
+
+        if certificate_url is None:
+            handle_invalid_coursera_link(idx, row, results)
+            stats["invalid_certificates"] += 1
+            continue
+
+        if linkedin_url is None:
+            handle_invalid_link(idx, row, results, INVALID_LINKEDIN_REASON)
+            stats["invalid_linkedin"] += 1
+            continue
+
+        certificate_urls.add(certificate_url)
+        linkedin_urls.add(linkedin_url)
+
+        # -------------------------
+        # PRE-FLIGHT: DUPLICATE CERTIFICATES
+        # -------------------------
+        # Reserved in file order, so the earliest submission of a
+        # certificate owns it however its fetches finish
+        item = (idx, row, links, certificate_index.resolve(certificate_key(certificate_url)))
+
+        status, owner = certificate_index.reserve(item[3], fingerprint, row["Roll Number"], item)
+
+        if status == "duplicate":
+            handle_duplicate_certificate(idx, row, results, owner)
+            continue
+
+        if status == "waiting":
+            stats["waiting"] += 1
+            continue
+
+        submit(item)
+
+    stats["certificate_urls"] = len(certificate_urls)
+    stats["linkedin_urls"] = len(linkedin_urls)
+
+    return stats
+
+
+# Sentinel the prefilter and every LLM worker, then wait for them
+def stop_llm_phase(workers, prefilter_thread, autoscaler, autoscaler_stop):
+
+    global retry_scheduler
+
+    autoscaler_stop.set()
+    autoscaler.join()
+
+    retry_scheduler.stop()
+    retry_scheduler = None
+
+    if prefilter_thread is not None:
+        prefilter_queue.put(None)
+        prefilter_thread.join()
+
+    for _ in workers:
+        llm_queue.put(None)
+
+    for w in workers:
+        w.join()
+
+
+def run_pipeline(input_filename, mode="threaded", use_cache=True, resume=True, sink=None,
+                 llm_batch_size=1, use_prefilter=PREFILTER_ENABLED,
+                 start=0, stop=None, rolls=None, output_path=None, store_results=True):
+
+    global checkpoints, retry_scheduler, prefilter
+
+    set_cache_bypass(not use_cache)
+    checkpoints = CheckpointStore()
 
     input_path = os.path.join("data", "inputs", input_filename)
-    df = pd.read_csv(input_path)
 
-    init_sheet()
+    if sink:
+        set_result_sink(sink)
+
+    init_result_sink()
+
+    # Keyed by row position in the input file
+    results = {}
+    evaluated = {}
+    certificate_index = CertificateIndex()
+
+    # Weighted by the past titles only, so scores don't depend on row order
+    prefilter = SimilarityPrefilter(load_catalog_titles()) if use_prefilter else None
+    catalog = get_project_catalog()
+
+    restored = checkpoints.load() if resume else {}
 
-    results = []
-    seen_certificates_by_roll = {}
+    page_flights.reset()
+    snapshot_flights.reset()
 
-    NUM_LLM_WORKERS = 2
-    FAST_WORKERS = 4
+    retry_scheduler = RetryScheduler(llm_queue)
+
+    prefilter_thread = None
+
+    if prefilter is not None:
+        prefilter_thread = threading.Thread(target=prefilter_worker, args=(results,))
+        prefilter_thread.start()
 
     workers = []
 
-    for _ in range(NUM_LLM_WORKERS):
-        t = threading.Thread(target=llm_worker, args=(results,))
+    for _ in range(min(LLM_MIN_WORKERS, LLM_MAX_WORKERS)):
+        t = threading.Thread(target=llm_worker, args=(results, llm_batch_size))
         t.start()
         workers.append(t)
 
-    subset = df.iloc[4449:4451].reset_index(drop=True)
+    autoscaler_stop = threading.Event()
+    autoscaler = threading.Thread(
+        target=llm_autoscaler,
+        args=(results, workers, llm_batch_size, autoscaler_stop),
+        daemon=True
+    )
+    autoscaler.start()
+
+    submissions = iter_submissions(input_path, start=start, stop=stop, rolls=rolls)
 
-    results = [None] * len(subset)
+    def ingest(submit):
+        return ingest_submissions(submissions, results, restored, submit, evaluated, certificate_index)
 
     # FAST PARALLEL
-    with ThreadPoolExecutor(max_workers=FAST_WORKERS) as executor:
-
-        futures = []
-
-        for idx, row in subset.iterrows():
-            futures.append(
-                executor.submit(
-                    process_fast_record,
-                    idx,
-                    row,
-                    results,
-                    seen_certificates_by_roll
-                )
+    # The CSV is only read here: if that (or anything else) fails, the
+    # LLM-side threads must still be stopped or the process never exits
+    try:
+        if mode == "async":
+            ingest_stats = asyncio.run(
+                run_fast_phase_async(ingest, results, certificate_index)
             )
 
+        else:
+            fast_queue = Queue(maxsize=FAST_QUEUE_SIZE)
+            fast_threads = []
+
+            for _ in range(FAST_WORKERS):
+                t = threading.Thread(target=fast_worker, args=(fast_queue, results, certificate_index))
+                t.start()
+                fast_threads.append(t)
+
+            try:
+                ingest_stats = ingest(fast_queue.put)
+
+            finally:
+                for _ in fast_threads:
+                    fast_queue.put(None)
+
+                for t in fast_threads:
+                    t.join()
+
+    except BaseException:
+        stop_llm_phase(workers, prefilter_thread, autoscaler, autoscaler_stop)
+        raise
+
+    debug_status(
+        "PIPELINE",
+        f"Resumed: {ingest_stats['resumed']} rows from checkpoint"
+        f" ({ingest_stats['resumed_llm']} awaiting LLM) | New: {ingest_stats['new']}"
+    )
+
+    fetched = ingest_stats["new"] - ingest_stats["invalid_certificates"] - ingest_stats["invalid_linkedin"]
 
-        for f in futures:
-            f.result()
+    debug_status(
+        "PREFLIGHT",
+        f"invalid certificate links: {ingest_stats['invalid_certificates']} | "
+        f"invalid LinkedIn links: {ingest_stats['invalid_linkedin']} | "
+        f"unique certificates: {ingest_stats['certificate_urls']}/{fetched} | "
+        f"unique LinkedIn posts: {ingest_stats['linkedin_urls']}/{fetched}"
+    )
 
     debug_status("PIPELINE", "FAST processing finished")
     debug_status("PIPELINE", f"Waiting LLM completion | Pending: {llm_queue.qsize()}")
 
+    # Everything the prefilter forwards is on llm_queue before join() returns
+    if prefilter is not None:
+        prefilter_queue.join()
+
+    # Retries are re-queued before their failed attempt is marked done,
+    # so join() only returns once every row has a final verdict
     llm_queue.join()
 
-    for _ in workers:
-        llm_queue.put(None)
+    stop_llm_phase(workers, prefilter_thread, autoscaler, autoscaler_stop)
 
-    for w in workers:
-        w.join()
+    flush_results_live()
+
+    ordered = [results[idx] for idx in sorted(results)]
+
+    output_path = output_path or os.path.join("data", "outputs", "Final_Evaluation_8.csv")
+    write_results(ordered, output_path)
 
-    output_path = os.path.join("data", "outputs", "Final_Evaluation_8.csv")
+    # Rows restored as done were stored by the run that decided them
+    stored = [idx for idx in sorted(evaluated) if idx in results]
 
-    output_df = pd.DataFrame(results)
+    if store_results and stored:
+        run_id = new_run_id()
 
-    output_df = output_df[[
-        "Roll Number",
-        "Full Name",
-        "Coursera Project",
-        "Certificate Completion Date",
-        "Project Mention Match",
-        "Final Verdict",
-        "Failure Reason"
-    ]]
+        store_path = append_run(
+            [results[idx] for idx in stored],
+            run_id,
+            model_version=GEMINI_MODEL if LLM_BACKEND == "gemini" else LLM_BACKEND,
+            input_file=input_filename,
+            fingerprints=[evaluated[idx] for idx in stored]
+        )
+
+        debug_status("RESULTS", f"run {run_id}: {len(stored)} rows -> {store_path}")
 
-    output_df.to_csv(output_path, index=False)
+    for line in format_http_stats():
+        debug_status("HTTP", line)
+
+    cache_stats = get_cache_stats()
+    debug_status(
+        "CACHE",
+        f"hits: {cache_stats['hits']} | misses: {cache_stats['misses']} | stored: {cache_stats['stores']}"
+    )
+
+    llm_cache_stats = get_llm_cache_stats()
+    debug_status(
+        "LLM CACHE",
+        f"hits: {llm_cache_stats['hits']} | misses: {llm_cache_stats['misses']}"
+    )
+
+    debug_status(
+        "LLM",
+        f"workers: {len(workers)} | retries: {llm_retries} | "
+        f"failed after retries: {llm_exhausted} | skipped (no LLM): {llm_skipped} | "
+        f"throttled: {rate_limiter.throttle_events} | "
+        f"rate-limit wait: {rate_limiter.waited_seconds:.1f}s"
+    )
+
+    if prefilter is not None:
+        prefilter_stats = get_prefilter_stats()
+        decided = prefilter_stats["match"] + prefilter_stats["no_match"]
+        screened = decided + prefilter_stats["ambiguous"]
+
+        debug_status(
+            "PREFILTER",
+            f"pass: {prefilter_stats['match']} | fail: {prefilter_stats['no_match']} | "
+            f"sent to LLM: {prefilter_stats['ambiguous']} | "
+            f"LLM calls avoided: {decided}/{screened} ({decided / max(screened, 1):.0%})"
+        )
+
+    for name, flights in (("certificate pages", page_flights), ("LinkedIn posts", snapshot_flights)):
+        flight_stats = flights.stats()
+        debug_status(
+            "PREFLIGHT",
+            f"{name} fetched: {flight_stats['executed']} | shared with another row: {flight_stats['shared']}"
+        )
+
+    debug_status(
+        "CERTIFICATES",
+        f"known: {len(certificate_index)} | duplicates rejected before fetch: {duplicates_before_fetch} | "
+        f"rows queued behind an earlier row's certificate: {ingest_stats['waiting']}"
+    )
+
+    debug_status(
+        "FETCH",
+        f"rows with a failed fetch: {fetch_errors} | rows that raised: {row_errors} "
+        f"(ERROR, retried on the next run)"
+    )
+
+    certificate_index.close()
+
+    debug_status(
+        "CATALOG",
+        f"titles: {len(catalog)} | posts naming a different project: {cross_project_rows}"
+    )
+
+    for path, count in sorted(get_name_match_stats().items()):
+        debug_status("NAME MATCH", f"{path}: {count}")
 
     debug_status("PIPELINE", "Evaluation Complete")
 
 
 if __name__ == "__main__":
-    run_pipeline("submission2.csv")
+
+    parser = argparse.ArgumentParser(description="Coursera submission evaluation pipeline")
+    parser.add_argument("input_filename", nargs="?", default="submission2.csv",
+                        help="CSV file under data/inputs")
+    parser.add_argument("--mode", choices=["threaded", "async"], default="threaded",
+                        help="FAST phase engine: thread pool or asyncio with per-host caps")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="bypass the on-disk HTTP response cache")
+    parser.add_argument("--no-resume", action="store_true",
+                        help="re-evaluate every row instead of resuming from checkpoints")
+    parser.add_argument("--llm-batch", type=int, default=1,
+                        help="evaluate up to N queued LLM rows per Gemini request (1 = off)")
+    parser.add_argument("--no-prefilter", action="store_true",
+                        help="send every non-exact match to the LLM instead of deciding "
+                             "clear matches / misses with the local similarity stage")
+    parser.add_argument("--start", type=int, default=0,
+                        help="first data row to evaluate (0-based, default: first row)")
+    parser.add_argument("--stop", type=int,
+                        help="evaluate rows before this one (default: to the end of the file)")
+    parser.add_argument("--roll", action="append", dest="rolls",
+                        help="only evaluate this roll number (repeatable)")
+    parser.add_argument("--output",
+                        help="evaluation CSV (or .parquet) to write "
+                             "(default: data/outputs/Final_Evaluation_8.csv)")
+    parser.add_argument("--no-store", action="store_true",
+                        help="don't append this run to the historical results store")
+    parser.add_argument("--sink", choices=["sheets", "csv", "none"],
+                        help="where live results go (default: RESULT_SINK env, "
+                             "sheets when credentials.json exists, else csv)")
+
+    args = parser.parse_args()
+
+    run_pipeline(
+        args.input_filename,
+        mode=args.mode,
+        use_cache=not args.no_cache,
+        resume=not args.no_resume,
+        sink=args.sink,
+        llm_batch_size=args.llm_batch,
+        use_prefilter=PREFILTER_ENABLED and not args.no_prefilter,
+        start=args.start,
+        stop=args.stop,
+        rolls=args.rolls,
+        output_path=args.output,
+        store_results=not args.no_store
+    )
+
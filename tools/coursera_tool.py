@@ -1,89 +1,229 @@
-import requests
+import asyncio
+import html
+import os
+import re
+import threading
 from bs4 import BeautifulSoup
-from playwright.sync_api import sync_playwright
 
+from utils.browser_pool import render_page_text
+from utils.http_client import http_get
+from utils.og_meta import extract_og_meta
+from utils.response_cache import get_cached_page, store_page
+from utils.single_flight import SingleFlight
 
-def verify_coursera_certificate(url, expected_name=None):
 
-    headers = {"User-Agent": "Mozilla/5.0"}
+# Rendering the certificate page in a browser is slow, so the fallback
+# stays off unless explicitly enabled.
+COURSERA_BROWSER_FALLBACK = os.getenv("COURSERA_BROWSER_FALLBACK", "0") == "1"
 
-    try:
-        # -------------------------
-        # FAST EXTRACTION (Requests)
-        # -------------------------
-        response = requests.get(url, headers=headers, timeout=10)
-        soup = BeautifulSoup(response.text, "html.parser")
+_JSON_LD_RE = re.compile(
+    r"""<script[^>]*type=["']application/ld\+json["'][^>]*>(.*?)</script>""",
+    re.IGNORECASE | re.DOTALL
+)
+_RECIPIENT_RE = re.compile(
+    r"completed\s+by\s*(?:<[^>]*>\s*)*([^<]{1,200})",
+    re.IGNORECASE
+)
+
+def raise_for_transient_status(status_code):
+    """Throttling / server errors say nothing about the certificate; fail the fetch instead."""
+
+    if status_code == 429 or status_code >= 500:
+        raise RuntimeError(f"HTTP {status_code}")
+
+
+# Rows that share a certificate URL wait for one fetch instead of each
+# making their own; finished pages are served by the response cache
+page_flights = SingleFlight()
+
+
+# -------------------------
+# NAME MATCH PATH COUNTERS
+# -------------------------
+_name_stats_lock = threading.Lock()
+_name_match_paths = {}
+
+
+def _record_name_path(path):
+    with _name_stats_lock:
+        _name_match_paths[path] = _name_match_paths.get(path, 0) + 1
+
+
+def get_name_match_stats():
+    with _name_stats_lock:
+        return dict(_name_match_paths)
+
+
+def _normalize_text(text):
+    return " ".join(html.unescape(text).lower().split()) if text else ""
+
+
+def find_student_name(page_html, og_data, expected_name):
+    """
+    Look for the student's name in the small, targeted regions of the
+    certificate page first (og: tags, JSON-LD, the "Completed by" block)
+    and only extract the full page text when all of them miss.
+
+    Returns the region that resolved the match, or None.
+    """
+
+    needle = _normalize_text(expected_name)
+
+    if needle in _normalize_text(" ".join(og_data.values())):
+        return "og"
+
+    for block in _JSON_LD_RE.findall(page_html):
+        if needle in _normalize_text(block):
+            return "json_ld"
+
+    for recipient in _RECIPIENT_RE.findall(page_html):
+        if needle in _normalize_text(recipient):
+            return "recipient"
+
+    page_text = BeautifulSoup(page_html, "html.parser").get_text(separator=" ")
+
+    if needle in _normalize_text(page_text):
+        return "full_text"
+
+    return None
+
+
+def evaluate_certificate_page(url, page_html, expected_name=None, final_url=None):
 
-        # OG extraction
-        og_data = {}
-        for tag in soup.find_all("meta"):
-            if tag.get("property", "").startswith("og:"):
-                og_data[tag["property"]] = tag.get("content", "")
+    # OG extraction
+    og_data = extract_og_meta(page_html)
 
-        project_name = og_data.get("og:title")
-        completion_date = og_data.get("og:description")  # Often contains completion info
+    project_name = og_data.get("og:title")
+    completion_date = og_data.get("og:description")  # Often contains completion info
 
-        if project_name:
-            project_name = " ".join(project_name.split()[3:])
+    if project_name:
+        project_name = " ".join(project_name.split()[3:])
 
-        # Extract static page text
-        page_text = soup.get_text(separator=" ")
+    name_found = False
 
-        name_found = False
+    if expected_name:
+        name_path = find_student_name(page_html, og_data, expected_name)
+        name_found = name_path is not None
 
-        if expected_name and expected_name.lower() in page_text.lower():
+        if name_found:
+            _record_name_path(name_path)
+
+    # -------------------------
+    # PLAYWRIGHT FALLBACK
+    # -------------------------
+    if not name_found and expected_name and COURSERA_BROWSER_FALLBACK:
+
+        print("\n⚠ Playwright fallback triggered")
+        print(f"URL: {url}")
+
+        rendered_text = render_page_text(url)
+
+        # Try extracting completion date from rendered page
+        completion_date_rendered = completion_date
+        if "completed" in rendered_text.lower():
+            completion_date_rendered = "Found in rendered page"
+
+        # Check name again
+        if _normalize_text(expected_name) in _normalize_text(rendered_text):
             name_found = True
+            _record_name_path("browser")
+
+        # ⭐ PRINT REQUIRED DATA
+        print("----- Coursera Extracted Data (Fallback) -----")
+        print(f"Student Name          : {expected_name}")
+        print(f"Coursera Project Name : {project_name}")
+        print(f"Completion Date       : {completion_date_rendered}")
+        print("------------------------------------------------\n")
+
+    if not name_found  and expected_name:
+        _record_name_path("not_found")
+        return {
+            "Cert_Status": "Fail",
+            "coursera_project_name": '',
+            "completion_date": '',
+            "student_name_found": '',
+            "final_url": final_url or url,
+        }
+    
+    return {
+        "Cert_Status": "Success",
+        "coursera_project_name": project_name,
+        "completion_date": completion_date,
+        "student_name_found": name_found,
+        "final_url": final_url or url,
+    }
+
+
+# (page HTML, URL after redirects): share links land on the verify page
+def fetch_certificate_page(url):
+
+    cached = get_cached_page(url)
+
+    if cached:
+        return cached["body"], cached.get("final_url", url)
 
-        # -------------------------
-        # PLAYWRIGHT FALLBACK
-        # -------------------------
-        # if not name_found and expected_name:
+    # -------------------------
+    # FAST EXTRACTION (Requests)
+    # -------------------------
+    response = http_get(url)
+    raise_for_transient_status(response.status_code)
+    page_html = response.text
 
-        #     print("\n⚠ Playwright fallback triggered")
-        #     print(f"URL: {url}")
+    store_page(url, response.status_code, response.headers, page_html, response.url)
 
-            # with sync_playwright() as p:
+    return page_html, response.url
 
-            #     browser = p.chromium.launch(headless=True)
-            #     page = browser.new_page()
 
-            #     page.goto(url, wait_until="networkidle")
+async def fetch_certificate_page_async(client, url):
 
-            #     rendered_text = page.locator("body").inner_text()
+    # Cache reads / writes are SQLite + zlib; keep them off the event loop
+    cached = await asyncio.to_thread(get_cached_page, url)
 
-            #     # Try extracting completion date from rendered page
-            #     completion_date_rendered = completion_date
-            #     if "completed" in rendered_text.lower():
-            #         completion_date_rendered = "Found in rendered page"
+    if cached:
+        return cached["body"], cached.get("final_url", url)
 
-            #     # Check name again
-            #     if expected_name.lower() in rendered_text.lower():
-            #         name_found = True
+    response = await client.get(url)
+    raise_for_transient_status(response.status_code)
+    page_html = response.text
 
-            #     # ⭐ PRINT REQUIRED DATA
-            #     print("----- Coursera Extracted Data (Fallback) -----")
-            #     print(f"Student Name          : {expected_name}")
-            #     print(f"Coursera Project Name : {project_name}")
-            #     print(f"Completion Date       : {completion_date_rendered}")
-            #     print("------------------------------------------------\n")
+    await asyncio.to_thread(
+        store_page, url, response.status_code, response.headers, page_html, str(response.url)
+    )
 
-            #     browser.close()
+    return page_html, str(response.url)
 
-        if not name_found  and expected_name:
-            return {
-                "Cert_Status": "Fail",
-                "coursera_project_name": '',
-                "completion_date": '',
-                "student_name_found": '',
-            }
-        
+
+def verify_coursera_certificate(url, expected_name=None):
+
+    try:
+        page_html, final_url = page_flights.do(url, lambda: fetch_certificate_page(url))
+
+        return evaluate_certificate_page(url, page_html, expected_name, final_url)
+
+    except Exception as e:
         return {
-            "Cert_Status": "Success",
-            "coursera_project_name": project_name,
-            "completion_date": completion_date,
-            "student_name_found": name_found,
+            "Cert_Status": "Error",
+            "error": str(e)
         }
 
+
+async def verify_coursera_certificate_async(client, url, expected_name=None):
+
+    try:
+        page_html, final_url = await page_flights.do_async(
+            url,
+            lambda: fetch_certificate_page_async(client, url)
+        )
+
+        # Name search and the browser fallback block, keep them off the loop
+        return await asyncio.to_thread(
+            evaluate_certificate_page,
+            url,
+            page_html,
+            expected_name,
+            final_url
+        )
+
     except Exception as e:
         return {
             "Cert_Status": "Error",
@@ -1,7 +1,109 @@
-import requests
+import asyncio
+import os
 import re
-from bs4 import BeautifulSoup
-from playwright.sync_api import sync_playwright
+
+from utils.browser_pool import render_page_text
+from utils.http_client import http_get
+from utils.og_meta import async_stream_og_meta, stream_og_meta
+from utils.project_matcher import PROJECT_MATCH_THRESHOLD
+from utils.project_matcher import get_matcher, project_match_score
+from utils.response_cache import get_cached_og, store_og
+from utils.single_flight import SingleFlight
+
+
+# Many rows point at the same post; og: snapshots are small, so each
+# one is kept for the run and shared by every row that needs it
+snapshot_flights = SingleFlight(ttl=int(os.getenv("LINKEDIN_SNAPSHOT_TTL", "900")))
+
+
+# -------------------------
+# LINKEDIN PAGE SNAPSHOT
+# -------------------------
+class LinkedInSnapshot:
+    """One fetch + parse of a LinkedIn post, shared by every check on the row."""
+
+    def __init__(self, url, status_code=None, og=None, error=None):
+        self.url = url
+        self.status_code = status_code
+        self.og = og or {}
+        self.error = error
+
+    @property
+    def ok(self):
+        return self.error is None
+
+    @property
+    def title(self):
+        return self.og.get("og:title")
+
+    @property
+    def description(self):
+        return self.og.get("og:description", "")
+
+    @property
+    def is_public(self):
+        return bool(self.description.strip())
+
+
+def is_transient_status(status_code):
+    # 999 is LinkedIn's "too many requests"
+    return status_code == 429 or status_code >= 500
+
+
+def fetch_linkedin_snapshot(url):
+    return snapshot_flights.do(url, lambda: _fetch_linkedin_snapshot(url))
+
+
+async def fetch_linkedin_snapshot_async(client, url):
+    return await snapshot_flights.do_async(url, lambda: _fetch_linkedin_snapshot_async(client, url))
+
+
+def _fetch_linkedin_snapshot(url):
+
+    cached = get_cached_og(url)
+
+    if cached:
+        return LinkedInSnapshot(url, cached["status"], cached["og"])
+
+    try:
+        response = http_get(url, stream=True)
+
+        if is_transient_status(response.status_code):
+            response.close()
+            return LinkedInSnapshot(url, response.status_code, error=f"HTTP {response.status_code}")
+
+        og = stream_og_meta(response)
+
+        store_og(url, response.status_code, og)
+
+        return LinkedInSnapshot(url, response.status_code, og)
+
+    except Exception as e:
+        return LinkedInSnapshot(url, error=str(e))
+
+
+async def _fetch_linkedin_snapshot_async(client, url):
+
+    # Cache reads / writes are SQLite; keep them off the event loop
+    cached = await asyncio.to_thread(get_cached_og, url)
+
+    if cached:
+        return LinkedInSnapshot(url, cached["status"], cached["og"])
+
+    try:
+        async with client.stream(url) as response:
+
+            if is_transient_status(response.status_code):
+                return LinkedInSnapshot(url, response.status_code, error=f"HTTP {response.status_code}")
+
+            og = await async_stream_og_meta(response)
+
+        await asyncio.to_thread(store_og, url, response.status_code, og)
+
+        return LinkedInSnapshot(url, response.status_code, og)
+
+    except Exception as e:
+        return LinkedInSnapshot(url, error=str(e))
 
 
 def normalize_name(text):
@@ -34,7 +136,7 @@ def extract_name_from_og_title(og_title):
     return og_title.split("|")[0].strip()
 
 
-def verify_linkedin_identity(url, student_name):
+def verify_linkedin_identity(url, student_name, snapshot=None):
 
     # ------------------------
     # Step 1 → Username Match
@@ -47,17 +149,11 @@ def verify_linkedin_identity(url, student_name):
     # ------------------------
     # Step 2 → OG Title Match
     # ------------------------
-    try:
-        headers = {"User-Agent": "Mozilla/5.0"}
-        response = requests.get(url, headers=headers, timeout=10)
-        soup = BeautifulSoup(response.text, "html.parser")
+    if snapshot is None:
+        snapshot = fetch_linkedin_snapshot(url)
 
-        og_title = None
-        for tag in soup.find_all("meta"):
-            if tag.get("property") == "og:title":
-                og_title = tag.get("content")
-
-        profile_name = extract_name_from_og_title(og_title)
+    try:
+        profile_name = extract_name_from_og_title(snapshot.title)
 
         if profile_name and normalize_name(student_name) in normalize_name(profile_name):
             return True
@@ -69,17 +165,9 @@ def verify_linkedin_identity(url, student_name):
     # Step 3 → Playwright fallback
     # ------------------------
     try:
-        with sync_playwright() as p:
-            browser = p.chromium.launch(headless=True)
-            page = browser.new_page()
-
-            page.goto(url, wait_until="networkidle")
-
-            rendered_text = page.locator("body").inner_text()
-
-            browser.close()
+        rendered_text = render_page_text(url)
 
-            return normalize_name(student_name) in normalize_name(rendered_text)
+        return normalize_name(student_name) in normalize_name(rendered_text)
 
     except:
         return False
@@ -90,35 +178,32 @@ def check_project_presence(linkedin_text, coursera_project):
     if not linkedin_text or not coursera_project:
         return False
 
-    return coursera_project.lower() in linkedin_text.lower()
+    return get_matcher(coursera_project).matches(linkedin_text)
 
 
-def get_linkedin_observations(url, student_name, coursera_project_name):
+def observations_from_snapshot(snapshot, student_name, coursera_project_name):
 
-    headers = {"User-Agent": "Mozilla/5.0"}
+    if not snapshot.ok:
+        return {
+            "status": "Fail",
+            "error": snapshot.error
+        }
 
     try:
-        response = requests.get(url, headers=headers, timeout=10)
-        soup = BeautifulSoup(response.text, "html.parser")
-
-        og = {}
-        for tag in soup.find_all("meta"):
-            if tag.get("property", "").startswith("og:"):
-                og[tag["property"]] = tag.get("content", "")
-
-        description = og.get("og:description", "")
-        is_public = bool(description.strip())
+        description = snapshot.description
 
         # ⭐ Identity verification using username + fallback
-        name_match = verify_linkedin_identity(url, student_name)
+        name_match = verify_linkedin_identity(snapshot.url, student_name, snapshot)
 
-        project_match = check_project_presence(description, coursera_project_name)
+        match_score = project_match_score(description, coursera_project_name)
+        project_match = match_score >= PROJECT_MATCH_THRESHOLD
 
         return {
             "status": "Success",
-            "public_visibility": is_public,
+            "public_visibility": snapshot.is_public,
             "student_name_found": name_match,
             "project_match": project_match,
+            "project_match_score": match_score,
             "linkedin_description": description 
         }
 
@@ -127,3 +212,23 @@ def get_linkedin_observations(url, student_name, coursera_project_name):
             "status": "Fail",
             "error": str(e)
         }
+
+
+def get_linkedin_observations(url, student_name, coursera_project_name):
+
+    snapshot = fetch_linkedin_snapshot(url)
+
+    return observations_from_snapshot(snapshot, student_name, coursera_project_name)
+
+
+async def get_linkedin_observations_async(client, url, student_name, coursera_project_name):
+
+    snapshot = await fetch_linkedin_snapshot_async(client, url)
+
+    # The identity check may fall back to the browser pool, which blocks
+    return await asyncio.to_thread(
+        observations_from_snapshot,
+        snapshot,
+        student_name,
+        coursera_project_name
+    )
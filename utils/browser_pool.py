@@ -0,0 +1,189 @@
+import atexit
+import os
+import threading
+from concurrent.futures import Future
+from queue import Queue
+
+
+# -------------------------
+# CONFIGURATION
+# -------------------------
+BROWSER_POOL_SIZE = int(os.getenv("BROWSER_POOL_SIZE", "2"))
+BROWSER_RECYCLE_AFTER = int(os.getenv("BROWSER_RECYCLE_AFTER", "50"))
+BROWSER_NAV_TIMEOUT_MS = int(os.getenv("BROWSER_NAV_TIMEOUT_MS", "30000"))
+BROWSER_BLOCKED_RESOURCES = frozenset(
+    r.strip()
+    for r in os.getenv("BROWSER_BLOCKED_RESOURCES", "image,font,media").split(",")
+    if r.strip()
+)
+
+
+# -------------------------
+# BROWSER POOL
+# -------------------------
+class BrowserPool:
+    """
+    Long-lived headless Chromium pages shared by every pipeline thread.
+
+    Playwright's sync API objects may only be used from the thread that
+    created them, so each slot is a dedicated thread that owns its own
+    browser, context and page. Callers hand over a function that takes
+    a page and wait for its result; at most `size` pages run at once.
+    """
+
+    def __init__(self, size=BROWSER_POOL_SIZE, recycle_after=BROWSER_RECYCLE_AFTER,
+                 blocked_resources=BROWSER_BLOCKED_RESOURCES):
+        self.size = max(1, size)
+        self.recycle_after = max(1, recycle_after)
+        self.blocked_resources = frozenset(blocked_resources)
+
+        self._tasks = Queue()
+        self._threads = []
+        self._lock = threading.Lock()
+
+    def _ensure_started(self):
+
+        with self._lock:
+            if self._threads:
+                return
+
+            for i in range(self.size):
+                t = threading.Thread(
+                    target=self._slot_worker,
+                    name=f"browser-pool-{i}",
+                    daemon=True
+                )
+                t.start()
+                self._threads.append(t)
+
+    def submit(self, fn):
+
+        self._ensure_started()
+
+        future = Future()
+        self._tasks.put((fn, future))
+        return future
+
+    def run(self, fn, timeout=None):
+        return self.submit(fn).result(timeout)
+
+    def render_text(self, url, wait_until="networkidle"):
+
+        def job(page):
+            page.goto(url, wait_until=wait_until, timeout=BROWSER_NAV_TIMEOUT_MS)
+            return page.locator("body").inner_text()
+
+        return self.run(job)
+
+    def shutdown(self):
+
+        with self._lock:
+            threads, self._threads = self._threads, []
+
+        for _ in threads:
+            self._tasks.put(None)
+
+        for t in threads:
+            t.join()
+
+    # -------------------------
+    # SLOT THREAD
+    # -------------------------
+    def _block_resources(self, route):
+
+        if route.request.resource_type in self.blocked_resources:
+            route.abort()
+        else:
+            route.continue_()
+
+    def _launch(self, playwright):
+
+        browser = playwright.chromium.launch(headless=True)
+        context = browser.new_context()
+
+        if self.blocked_resources:
+            context.route("**/*", self._block_resources)
+
+        return browser, context
+
+    @staticmethod
+    def _close(browser):
+
+        if browser is None:
+            return
+
+        try:
+            browser.close()
+        except Exception:
+            pass
+
+    def _slot_worker(self):
+
+        from playwright.sync_api import sync_playwright
+
+        with sync_playwright() as p:
+
+            browser = context = page = None
+            pages_served = 0
+
+            while True:
+
+                task = self._tasks.get()
+
+                if task is None:
+                    break
+
+                fn, future = task
+
+                if not future.set_running_or_notify_cancel():
+                    continue
+
+                try:
+                    # Recycle the whole browser periodically to cap RSS growth
+                    if browser is None or pages_served >= self.recycle_after:
+                        self._close(browser)
+                        browser = context = page = None
+                        browser, context = self._launch(p)
+                        pages_served = 0
+
+                    if page is None:
+                        page = context.new_page()
+
+                    pages_served += 1
+                    future.set_result(fn(page))
+
+                except Exception as e:
+                    future.set_exception(e)
+
+                    # Never hand a page in an unknown state to the next row
+                    try:
+                        if page is not None:
+                            page.close()
+                    except Exception:
+                        self._close(browser)
+                        browser = context = None
+
+                    page = None
+
+            self._close(browser)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_browser_pool():
+
+    global _pool
+
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = BrowserPool()
+                atexit.register(_pool.shutdown)
+
+    return _pool
+
+
+def render_page_text(url, wait_until="networkidle"):
+    return get_browser_pool().render_text(url, wait_until)
@@ -0,0 +1,232 @@
+import os
+import re
+import sqlite3
+import threading
+import time
+from urllib.parse import urlsplit
+
+
+# -------------------------
+# CONFIGURATION
+# -------------------------
+CERTIFICATE_INDEX_PATH = os.getenv(
+    "CERTIFICATE_INDEX_PATH",
+    os.path.join("data", "checkpoints", "certificates.sqlite3")
+)
+
+# verify / certificate / records / pdf links all carry the same ID
+_VERIFY_ID_RE = re.compile(r"/(?:verify|certificate|records|pdf)/([A-Za-z0-9]{8,})", re.IGNORECASE)
+_SHARE_ID_RE = re.compile(r"/share/([0-9a-f]{32})", re.IGNORECASE)
+
+
+def certificate_key(url):
+    """
+    Normalized identity of a certificate link: "verify:<ID>" for the
+    verify/certificate/records/pdf forms, "share:<hash>" for share
+    links, else the bare host + path. None for an empty link.
+    """
+
+    url = (url or "").strip()
+
+    if not url:
+        return None
+
+    match = _VERIFY_ID_RE.search(url)
+    if match:
+        return "verify:" + match.group(1).upper()
+
+    match = _SHARE_ID_RE.search(url)
+    if match:
+        return "share:" + match.group(1).lower()
+
+    parts = urlsplit(url if "://" in url else "https://" + url)
+    host = (parts.hostname or "").lower()
+
+    if host.startswith("www."):
+        host = host[4:]
+
+    return "url:" + host + parts.path.rstrip("/").lower()
+
+
+# -------------------------
+# CERTIFICATE INDEX
+# -------------------------
+class CertificateIndex:
+    """
+    Every certificate ever accepted, across runs and roll numbers, keyed
+    by verify ID, plus the verify ID each fetched share link led to. The
+    SQLite tables are loaded into dicts once, so lookups are O(1) and
+    need no I/O; claims and aliases write through to disk.
+    """
+
+    def __init__(self, path=CERTIFICATE_INDEX_PATH):
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+        self.path = path
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS certificates (
+                cert_key TEXT PRIMARY KEY,
+                fingerprint TEXT NOT NULL,
+                roll TEXT NOT NULL,
+                first_seen REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS aliases (
+                link_key TEXT PRIMARY KEY,
+                cert_key TEXT NOT NULL
+            )
+            """
+        )
+        self._conn.commit()
+
+        self._owners = {
+            cert_key: (fingerprint, roll)
+            for cert_key, fingerprint, roll in self._conn.execute(
+                "SELECT cert_key, fingerprint, roll FROM certificates"
+            )
+        }
+
+        self._aliases = dict(self._conn.execute("SELECT link_key, cert_key FROM aliases"))
+
+        # This run only: key -> (fingerprint, roll) of the row being
+        # evaluated with it, and the later rows queued behind that row
+        self._reserved = {}
+        self._waiting = {}
+
+    def __len__(self):
+        return len(self._owners)
+
+    def resolve(self, cert_key):
+        """The verify key a share link is known to lead to, else cert_key itself."""
+        return self._aliases.get(cert_key, cert_key)
+
+    def add_alias(self, link_key, cert_key):
+        """Remember that link_key (a share link) resolved to cert_key."""
+
+        if not link_key or not cert_key or link_key == cert_key:
+            return
+
+        with self._lock:
+
+            if self._aliases.get(link_key) == cert_key:
+                return
+
+            self._aliases[link_key] = cert_key
+            self._conn.execute(
+                "INSERT OR REPLACE INTO aliases VALUES (?, ?)",
+                (link_key, cert_key)
+            )
+            self._conn.commit()
+
+    def owner(self, cert_key):
+        """(fingerprint, roll) of the submission that holds cert_key, or None."""
+        return self._owners.get(cert_key)
+
+    def reserve(self, cert_key, fingerprint, roll, item):
+        """
+        Called in file order before a row is fetched. Returns
+        ("duplicate", owner) if another submission owns cert_key,
+        ("waiting", holder) if an earlier row of this run is still being
+        evaluated with it (item comes back from release()), else
+        ("reserved", None) and the row holds cert_key until release().
+        """
+
+        if not cert_key:
+            return "reserved", None
+
+        with self._lock:
+
+            owner = self._owners.get(cert_key)
+            if owner is not None and owner[0] != fingerprint:
+                return "duplicate", owner
+
+            holder = self._reserved.get(cert_key)
+            if holder is not None and holder[0] != fingerprint:
+                self._waiting.setdefault(cert_key, []).append((fingerprint, str(roll), item))
+                return "waiting", holder
+
+            self._reserved[cert_key] = (fingerprint, str(roll))
+
+        return "reserved", None
+
+    def release(self, cert_key, fingerprint):
+        """
+        The row holding cert_key is done. Returns (duplicates, owner,
+        next_item): if the certificate now has an owner every queued row
+        is a duplicate of it, else the earliest queued row takes over the
+        reservation and is returned to be evaluated.
+        """
+
+        with self._lock:
+
+            holder = self._reserved.get(cert_key)
+            if holder is None or holder[0] != fingerprint:
+                return [], None, None
+
+            del self._reserved[cert_key]
+            waiting = self._waiting.pop(cert_key, [])
+
+            if not waiting:
+                return [], None, None
+
+            owner = self._owners.get(self.resolve(cert_key))
+            if owner is not None:
+                return [item for _, _, item in waiting], owner, None
+
+            next_fingerprint, next_roll, next_item = waiting.pop(0)
+            self._reserved[cert_key] = (next_fingerprint, next_roll)
+
+            if waiting:
+                self._waiting[cert_key] = waiting
+
+        return [], None, next_item
+
+    def claim(self, cert_key, fingerprint, roll, item=None):
+        """
+        Record fingerprint as the owner of cert_key, the verify key its
+        link led to. Returns ("duplicate", owner) if another submission
+        owns it; ("waiting", holder) if another row of this run is still
+        being evaluated with it (a share link that led to a verify link
+        reserved in pre-flight), with item queued behind that row as in
+        reserve(); else ("claimed", None).
+        """
+
+        if not cert_key:
+            return "claimed", None
+
+        with self._lock:
+
+            owner = self._owners.get(cert_key)
+
+            if owner is not None:
+                return ("claimed", None) if owner[0] == fingerprint else ("duplicate", owner)
+
+            holder = self._reserved.get(cert_key)
+
+            if item is not None and holder is not None and holder[0] != fingerprint:
+                self._waiting.setdefault(cert_key, []).append((fingerprint, str(roll), item))
+                return "waiting", holder
+
+            self._owners[cert_key] = (fingerprint, str(roll))
+            self._conn.execute(
+                "INSERT OR IGNORE INTO certificates VALUES (?, ?, ?, ?)",
+                (cert_key, fingerprint, str(roll), time.time())
+            )
+            self._conn.commit()
+
+        return "claimed", None
+
+    def close(self):
+
+        with self._lock:
+            self._conn.close()
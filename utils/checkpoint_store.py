@@ -0,0 +1,121 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+
+# -------------------------
+# CONFIGURATION
+# -------------------------
+CHECKPOINT_PATH = os.getenv(
+    "CHECKPOINT_PATH",
+    os.path.join("data", "checkpoints", "pipeline.sqlite3")
+)
+
+STATUS_LLM_PENDING = "llm_pending"
+STATUS_DONE = "done"
+
+# A page could not be fetched (timeout, 5xx, ...); evaluated again on resume
+STATUS_FETCH_ERROR = "fetch_error"
+
+
+def submission_fingerprint(row):
+    """Stable id for one form submission: timestamp + roll + certificate URL."""
+
+    parts = [
+        str(row.get("Timestamp", "")).strip(),
+        str(row["Roll Number"]).strip(),
+        str(row["Coursera completion certificate link"]).strip(),
+    ]
+
+    return hashlib.sha1("|".join(parts).encode("utf-8")).hexdigest()
+
+
+def _json_default(value):
+
+    # numpy scalars coming out of pandas rows
+    if hasattr(value, "item"):
+        return value.item()
+
+    return str(value)
+
+
+# -------------------------
+# CHECKPOINT STORE
+# -------------------------
+class CheckpointStore:
+    """
+    Durable per-row outcome log. A row is written once its FAST phase
+    finishes (done, or waiting on the LLM) and again when the LLM
+    verdict lands, so a restarted run can pick up where it stopped.
+    """
+
+    def __init__(self, path=CHECKPOINT_PATH):
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+        self.path = path
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS checkpoints (
+                fingerprint TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                result TEXT NOT NULL,
+                llm_task TEXT,
+                updated_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.commit()
+
+    def load(self):
+
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT fingerprint, status, result, llm_task FROM checkpoints"
+            ).fetchall()
+
+        return {
+            fingerprint: (
+                status,
+                json.loads(result),
+                json.loads(llm_task) if llm_task else None
+            )
+            for fingerprint, status, result, llm_task in rows
+        }
+
+    def _save(self, fingerprint, status, result, llm_task):
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO checkpoints VALUES (?, ?, ?, ?, ?)",
+                (
+                    fingerprint,
+                    status,
+                    json.dumps(result, default=_json_default),
+                    json.dumps(llm_task, default=_json_default) if llm_task else None,
+                    time.time()
+                )
+            )
+            self._conn.commit()
+
+    def mark_llm_pending(self, fingerprint, result, llm_task):
+        self._save(fingerprint, STATUS_LLM_PENDING, result, llm_task)
+
+    def mark_done(self, fingerprint, result):
+        self._save(fingerprint, STATUS_DONE, result, None)
+
+    def mark_fetch_error(self, fingerprint, result):
+        self._save(fingerprint, STATUS_FETCH_ERROR, result, None)
+
+    def close(self):
+
+        with self._lock:
+            self._conn.close()
@@ -157,38 +157,25 @@
 
 import os
 import json
-from google import genai
+import hashlib
+import threading
+import time
 from pydantic import BaseModel # Recommended for strict JSON
 
+from utils.llm_cache import get_cached_verdict, store_verdict
+from utils.rate_limiter import RateLimiter
+
 # -----------------------------
 # Configure Gemini Client
 # -----------------------------
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 
-client = genai.Client(api_key=GEMINI_API_KEY)
-
-class EvaluationResult(BaseModel):
-    match: bool
-    confidence: int
-    reason: str
-
-# ---------------------------------------------------
-# MAIN CONTEXT MATCH FUNCTION (Gemini - New SDK)
-# ---------------------------------------------------
-
-def llm_project_context_match(project_name, linkedin_text):
+# "gemini" or "offline" (no API calls, every row is a non-match)
+LLM_BACKEND = os.getenv("LLM_BACKEND", "gemini")
 
-    linkedin_text = linkedin_text[:1500]
-    print("LinkedIn Text Length:", len(linkedin_text))
+GEMINI_MODEL = "gemini-1.5-flash"
 
-    if not GEMINI_API_KEY:
-        return {
-            "match": False,
-            "confidence": 0,
-            "reason": "Gemini API key not configured"
-        }
-
-    prompt = f"""
+PROMPT_TEMPLATE = """
 You are a STRICT but INTELLIGENT academic evaluator.
 
 Project Title:
@@ -205,31 +192,187 @@ Rules:
 Return STRICT JSON only.
 """
 
+# Any edit to the prompt or model changes the tag and so invalidates
+# previously cached verdicts
+PROMPT_VERSION = hashlib.sha1(PROMPT_TEMPLATE.encode("utf-8")).hexdigest()[:12]
+LLM_VERSION_TAG = f"{GEMINI_MODEL}:{PROMPT_VERSION}"
+
+BATCH_PROMPT_TEMPLATE = """
+You are a STRICT but INTELLIGENT academic evaluator.
+
+Evaluate EACH item below independently. Every item has its own
+Project Title and LinkedIn Post.
+
+Rules:
+- If ANY project in the post meaningfully matches the item's title, return true.
+- Use semantic similarity.
+- Must demonstrate hands-on work.
+
+{items}
+
+Return STRICT JSON only: one entry per item, with the item's id.
+"""
+
+BATCH_ITEM_TEMPLATE = """----- Item {id} -----
+Project Title:
+{project_name}
+
+LinkedIn Post:
+{linkedin_text}
+"""
+
+BATCH_PROMPT_VERSION = hashlib.sha1(
+    (BATCH_PROMPT_TEMPLATE + BATCH_ITEM_TEMPLATE).encode("utf-8")
+).hexdigest()[:12]
+LLM_BATCH_VERSION_TAG = f"{GEMINI_MODEL}:batch:{BATCH_PROMPT_VERSION}"
+
+# Quota the shared rate limiter paces every Gemini call against
+GEMINI_RPM = int(os.getenv("GEMINI_RPM", "15"))
+GEMINI_TPM = int(os.getenv("GEMINI_TPM", "1000000"))
+
+RETRYABLE_STATUS = {408, 429, 500, 502, 503, 504}
+
+_client = None
+_client_lock = threading.Lock()
+
+rate_limiter = RateLimiter(GEMINI_RPM, GEMINI_TPM)
+
+
+class LLMRequestError(Exception):
+    """A Gemini call that failed before producing a verdict."""
+
+    def __init__(self, message, retryable=True, status=None):
+        super().__init__(message)
+        self.retryable = retryable
+        self.status = status
+
+
+class LLMUnavailableError(LLMRequestError):
+    """No LLM to ask (offline backend, no API key): the row was not evaluated at all."""
+
+    def __init__(self, message):
+        super().__init__(message, retryable=False)
+
+
+def get_client():
+
+    global _client
+
+    # Built on first use so importing this module never touches the network
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                from google import genai
+                _client = genai.Client(api_key=GEMINI_API_KEY)
+
+    return _client
+
+class EvaluationResult(BaseModel):
+    match: bool
+    confidence: int
+    reason: str
+
+
+class BatchEvaluationResult(EvaluationResult):
+    id: int
+
+
+def _generate(prompt, response_schema, max_output_tokens):
+
+    # ~4 characters per token is close enough for budgeting
+    rate_limiter.acquire(len(prompt) // 4 + max_output_tokens)
+
+    start = time.monotonic()
+
     try:
-        response = client.models.generate_content(
-            model="gemini-1.5-flash",
+        response = get_client().models.generate_content(
+            model=GEMINI_MODEL,
             contents=prompt,
             config={
                 "response_mime_type": "application/json",
-                "response_schema": EvaluationResult,
-                "max_output_tokens": 120,
+                "response_schema": response_schema,
+                "max_output_tokens": max_output_tokens,
                 "temperature": 0.1,
             }
         )
 
+    except Exception as e:
+        status = getattr(e, "code", None) or getattr(e, "status_code", None)
+
+        if status == 429:
+            rate_limiter.on_throttled(pause_seconds=5)
+
+        # Client-side mistakes (bad key, bad request) will not get better
+        retryable = not isinstance(status, int) or status in RETRYABLE_STATUS or status >= 500
+
+        raise LLMRequestError(str(e), retryable=retryable, status=status) from e
+
+    rate_limiter.on_success(time.monotonic() - start)
+
+    if response.parsed is None:
+        raise LLMRequestError("Gemini returned no parsable output")
+
+    return response.parsed
+
+# ---------------------------------------------------
+# MAIN CONTEXT MATCH FUNCTION (Gemini - New SDK)
+# ---------------------------------------------------
+
+def llm_project_context_match(project_name, linkedin_text, raise_errors=False):
+
+    linkedin_text = linkedin_text[:1500]
+    print("LinkedIn Text Length:", len(linkedin_text))
+
+    if LLM_BACKEND == "offline" or not GEMINI_API_KEY:
+
+        reason = (
+            "LLM validation disabled (offline backend)"
+            if LLM_BACKEND == "offline" else "Gemini API key not configured"
+        )
+
+        # Not a verdict: callers that record results must not store it as one
+        if raise_errors:
+            raise LLMUnavailableError(reason)
+
+        return {
+            "match": False,
+            "confidence": 0,
+            "reason": reason
+        }
+
+    # Every verdict carries the version of the prompt that produced it
+    cached = get_cached_verdict(project_name, linkedin_text, LLM_VERSION_TAG)
+
+    if cached is not None:
+        return {**cached, "prompt_version": PROMPT_VERSION}
+
+    prompt = PROMPT_TEMPLATE.format(
+        project_name=project_name,
+        linkedin_text=linkedin_text
+    )
+
+    try:
         # 🔥 IMPORTANT — no manual parsing needed
-        structured_output = response.parsed
+        structured_output = _generate(prompt, EvaluationResult, 120)
 
         print("Gemini structured output:", structured_output)
 
-        return {
+        verdict = {
             "match": structured_output.match,
             "confidence": structured_output.confidence,
             "reason": structured_output.reason
         }
 
+        store_verdict(project_name, linkedin_text, LLM_VERSION_TAG, verdict)
+
+        return {**verdict, "prompt_version": PROMPT_VERSION}
+
     except Exception as e:
         print("Gemini ERROR:", e)
+
+        if raise_errors:
+            raise
+
         return {
             "match": False,
             "confidence": 0,
@@ -237,6 +380,93 @@ Return STRICT JSON only.
         }
 
 
+# ---------------------------------------------------
+# BATCHED CONTEXT MATCH (several rows per request)
+# ---------------------------------------------------
+
+def llm_project_context_match_batch(items, raise_errors=False):
+    """
+    Evaluate several (project_name, linkedin_text) pairs in one Gemini
+    request. Returns one verdict dict per item, in order. Items the
+    batch response leaves out, or the whole batch on error, fall back
+    to single llm_project_context_match calls; each verdict's
+    prompt_version says which prompt decided it. With raise_errors, items
+    that could not be evaluated get their exception instead of a verdict.
+    """
+
+    def single(project_name, linkedin_text):
+        try:
+            return llm_project_context_match(project_name, linkedin_text, raise_errors)
+        except Exception as e:
+            return e
+
+    items = [(project_name, (linkedin_text or "")[:1500]) for project_name, linkedin_text in items]
+    verdicts = [None] * len(items)
+
+    if LLM_BACKEND == "offline" or not GEMINI_API_KEY or len(items) == 1:
+        return [single(p, t) for p, t in items]
+
+    # Either prompt's verdict is valid for the current model
+    for i, (project_name, linkedin_text) in enumerate(items):
+
+        for tag, prompt_version in (
+            (LLM_VERSION_TAG, PROMPT_VERSION),
+            (LLM_BATCH_VERSION_TAG, BATCH_PROMPT_VERSION)
+        ):
+            cached = get_cached_verdict(project_name, linkedin_text, tag)
+
+            if cached is not None:
+                verdicts[i] = {**cached, "prompt_version": prompt_version}
+                break
+
+    todo = [i for i, verdict in enumerate(verdicts) if verdict is None]
+
+    if len(todo) > 1:
+
+        prompt = BATCH_PROMPT_TEMPLATE.format(items="\n".join(
+            BATCH_ITEM_TEMPLATE.format(
+                id=i,
+                project_name=items[i][0],
+                linkedin_text=items[i][1]
+            )
+            for i in todo
+        ))
+
+        try:
+            parsed = _generate(prompt, list[BatchEvaluationResult], 120 * len(todo))
+
+            print(f"Gemini batch output: {len(parsed)}/{len(todo)} items")
+
+            for item in parsed:
+
+                if item.id not in todo or verdicts[item.id] is not None:
+                    continue
+
+                verdict = {
+                    "match": item.match,
+                    "confidence": item.confidence,
+                    "reason": item.reason
+                }
+
+                store_verdict(*items[item.id], LLM_BATCH_VERSION_TAG, verdict)
+                verdicts[item.id] = {**verdict, "prompt_version": BATCH_PROMPT_VERSION}
+
+        except Exception as e:
+            print("Gemini batch ERROR:", e)
+
+            # Let the caller back off instead of firing len(todo) more
+            # requests into the same throttled quota
+            if raise_errors and isinstance(e, LLMRequestError) and e.retryable:
+                for i in todo:
+                    verdicts[i] = e
+
+    for i in todo:
+        if verdicts[i] is None:
+            verdicts[i] = single(*items[i])
+
+    return verdicts
+
+
 # def llm_project_context_match(project_name, linkedin_text):
 
 #     # reduce token size...
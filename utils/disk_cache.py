@@ -0,0 +1,130 @@
+import os
+import sqlite3
+import threading
+import time
+
+
+# -------------------------
+# SQLITE LRU CACHE
+# -------------------------
+class DiskCache:
+    """
+    Small persistent key -> bytes store with per-entry TTL and a total
+    size cap. Once the cap is exceeded the least recently read entries
+    are evicted first. Safe to share between threads.
+    """
+
+    def __init__(self, path, max_bytes):
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+        self.path = path
+        self.max_bytes = max_bytes
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                value BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                expires_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS entries_last_access ON entries (last_access)"
+        )
+        self._conn.commit()
+
+        self._total_bytes = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM entries"
+        ).fetchone()[0]
+
+    def get(self, key):
+
+        now = time.time()
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, size, expires_at FROM entries WHERE key = ?",
+                (key,)
+            ).fetchone()
+
+            if row is None:
+                return None
+
+            value, size, expires_at = row
+
+            if expires_at <= now:
+                self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                self._conn.commit()
+                self._total_bytes -= size
+                return None
+
+            self._conn.execute(
+                "UPDATE entries SET last_access = ? WHERE key = ?",
+                (now, key)
+            )
+            self._conn.commit()
+
+            return value
+
+    def set(self, key, value, ttl):
+
+        now = time.time()
+        size = len(value)
+
+        with self._lock:
+            old = self._conn.execute(
+                "SELECT size FROM entries WHERE key = ?",
+                (key,)
+            ).fetchone()
+
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?)",
+                (key, value, size, now + ttl, now)
+            )
+
+            self._total_bytes += size - (old[0] if old else 0)
+            self._evict()
+            self._conn.commit()
+
+    def delete(self, key):
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT size FROM entries WHERE key = ?",
+                (key,)
+            ).fetchone()
+
+            if row:
+                self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                self._conn.commit()
+                self._total_bytes -= row[0]
+
+    def _evict(self):
+
+        if self._total_bytes <= self.max_bytes:
+            return
+
+        # Expired entries go first, then least recently used
+        for key, size in self._conn.execute(
+            "SELECT key, size FROM entries ORDER BY expires_at > ?, last_access",
+            (time.time(),)
+        ).fetchall():
+
+            if self._total_bytes <= self.max_bytes:
+                break
+
+            self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            self._total_bytes -= size
+
+    def close(self):
+
+        with self._lock:
+            self._conn.close()
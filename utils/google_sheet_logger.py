@@ -1,28 +1,60 @@
 import gspread
 from oauth2client.service_account import ServiceAccountCredentials
+import atexit
+import os
+import random
 import threading
+import time
+from queue import Queue, Empty
+
+from utils.result_sinks import ResultSink, SHEET_HEADERS
 
 # Thread safety lock
 sheet_lock = threading.Lock()
 
 # -------------------------
-# AUTHENTICATION
+# BATCHED WRITER SETTINGS
+# -------------------------
+SHEET_BATCH_SIZE = int(os.getenv("SHEET_BATCH_SIZE", "50"))
+SHEET_FLUSH_INTERVAL_MS = int(os.getenv("SHEET_FLUSH_INTERVAL_MS", "2000"))
+SHEET_QUEUE_MAX = int(os.getenv("SHEET_QUEUE_MAX", "5000"))
+SHEET_MAX_RETRIES = int(os.getenv("SHEET_MAX_RETRIES", "6"))
+
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+# -------------------------
+# AUTHENTICATION (lazy)
 # -------------------------
 scope = [
     "https://spreadsheets.google.com/feeds",
     "https://www.googleapis.com/auth/drive"
 ]
 
-creds = ServiceAccountCredentials.from_json_keyfile_name(
-    "credentials.json", scope
-)
+SHEET_CREDENTIALS = os.getenv("SHEET_CREDENTIALS", "credentials.json")
+SHEET_NAME = os.getenv("SHEET_NAME", "Evaluation_Live_Output")
 
-client = gspread.authorize(creds)
+_sheet = None
 
-# -------------------------
-# OPEN SHEET
-# -------------------------
-sheet = client.open("Evaluation_Live_Output").sheet1
+
+def get_sheet():
+
+    global _sheet
+
+    if _sheet is None:
+        with sheet_lock:
+            if _sheet is None:
+                creds = ServiceAccountCredentials.from_json_keyfile_name(
+                    SHEET_CREDENTIALS, scope
+                )
+
+                client = gspread.authorize(creds)
+
+                # -------------------------
+                # OPEN SHEET
+                # -------------------------
+                _sheet = client.open(SHEET_NAME).sheet1
+
+    return _sheet
 
 
 # -------------------------
@@ -30,30 +62,142 @@ sheet = client.open("Evaluation_Live_Output").sheet1
 # -------------------------
 def init_sheet():
 
-    headers = [
-        "Roll Number",
-        "Full Name",
-        "Coursera Project",
-        "Certificate Completion Date",
-        "Project Mention Match",
-        "Final Verdict",
-        "Failure Reason"
-    ]
-
+    sheet = get_sheet()
     existing = sheet.row_values(1)
 
-    if existing != headers:
+    if existing != SHEET_HEADERS:
         sheet.clear()
-        sheet.append_row(headers)
+        sheet.append_row(SHEET_HEADERS)
         print("✅ Google Sheet headers initialized")
     else:
         print("ℹ️ Google Sheet headers already present")
 
 
+# -------------------------
+# BACKGROUND BATCH WRITER
+# -------------------------
+_STOP = object()
+
+_row_queue = Queue(maxsize=SHEET_QUEUE_MAX)
+_writer_thread = None
+_writer_lock = threading.Lock()
+
+
+def _append_rows_with_retry(rows):
+
+    for attempt in range(SHEET_MAX_RETRIES + 1):
+
+        try:
+            sheet = get_sheet()
+
+            with sheet_lock:
+                sheet.append_rows(rows)
+            return
+
+        except gspread.exceptions.APIError as e:
+            status = getattr(e.response, "status_code", None)
+
+            if status not in RETRYABLE_STATUS or attempt == SHEET_MAX_RETRIES:
+                print(f"❌ Google Sheet append failed, {len(rows)} rows not logged: {e}")
+                return
+
+            # Exponential backoff with jitter, capped at one minute
+            delay = min(60, 2 ** attempt) + random.uniform(0, 1)
+            print(f"⚠️ Google Sheet returned {status}, retrying in {delay:.1f}s")
+            time.sleep(delay)
+
+        except Exception as e:
+            print(f"❌ Google Sheet append failed, {len(rows)} rows not logged: {e}")
+            return
+
+
+def _writer_loop():
+
+    interval = SHEET_FLUSH_INTERVAL_MS / 1000
+    batch = []
+    deadline = None
+
+    while True:
+
+        timeout = None if deadline is None else max(0, deadline - time.monotonic())
+
+        try:
+            item = _row_queue.get(timeout=timeout)
+        except Empty:
+            item = None
+
+        if item is _STOP:
+            break
+
+        if item is not None:
+            batch.append(item)
+
+            if deadline is None:
+                deadline = time.monotonic() + interval
+
+        if batch and (len(batch) >= SHEET_BATCH_SIZE or time.monotonic() >= deadline):
+            _append_rows_with_retry(batch)
+            batch = []
+            deadline = None
+
+    if batch:
+        _append_rows_with_retry(batch)
+
+
+def _ensure_writer():
+
+    global _writer_thread
+
+    if _writer_thread is None:
+        with _writer_lock:
+            if _writer_thread is None:
+                t = threading.Thread(target=_writer_loop, name="sheet-writer", daemon=True)
+                t.start()
+                _writer_thread = t
+
+
 # -------------------------
 # APPEND LIVE ROW
 # -------------------------
 def append_result_live(row_data):
 
-    with sheet_lock:
-        sheet.append_row(row_data)
+    # Only blocks when the writer is SHEET_QUEUE_MAX rows behind
+    _ensure_writer()
+    _row_queue.put(list(row_data))
+
+
+# -------------------------
+# FINAL FLUSH
+# -------------------------
+def flush_results_live():
+
+    global _writer_thread
+
+    with _writer_lock:
+        t, _writer_thread = _writer_thread, None
+
+    if t is None:
+        return
+
+    _row_queue.put(_STOP)
+    t.join()
+
+
+atexit.register(flush_results_live)
+
+
+# -------------------------
+# SINK ADAPTER
+# -------------------------
+class GoogleSheetSink(ResultSink):
+
+    name = "sheets"
+
+    def init(self):
+        init_sheet()
+
+    def append(self, row_data):
+        append_result_live(row_data)
+
+    def flush(self):
+        flush_results_live()
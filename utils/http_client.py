@@ -0,0 +1,298 @@
+import asyncio
+import os
+import threading
+import time
+from contextlib import asynccontextmanager
+from http import cookiejar
+from urllib.parse import urlsplit
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+
+# -------------------------
+# CONFIGURATION
+# -------------------------
+HTTP_POOL_HOSTS = int(os.getenv("HTTP_POOL_HOSTS", "10"))
+HTTP_POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", "16"))
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "5"))
+HTTP_READ_TIMEOUT = float(os.getenv("HTTP_READ_TIMEOUT", "10"))
+HTTP_KEEP_ALIVE = os.getenv("HTTP_KEEP_ALIVE", "1") != "0"
+
+# asyncio mode: total requests in flight and the cap per host
+ASYNC_MAX_IN_FLIGHT = int(os.getenv("ASYNC_MAX_IN_FLIGHT", "200"))
+ASYNC_PER_HOST_LIMIT = int(os.getenv("ASYNC_PER_HOST_LIMIT", "32"))
+
+DEFAULT_HEADERS = {"User-Agent": "Mozilla/5.0"}
+
+
+# -------------------------
+# PER-HOST STATS
+# -------------------------
+_stats_lock = threading.Lock()
+_host_stats = {}
+
+
+def _host_entry(host):
+    entry = _host_stats.get(host)
+
+    if entry is None:
+        entry = {
+            "requests": 0,
+            "errors": 0,
+            "new_connections": 0,
+            "total_latency": 0.0,
+            "max_latency": 0.0,
+        }
+        _host_stats[host] = entry
+
+    return entry
+
+
+def _record_new_connection(host):
+    with _stats_lock:
+        _host_entry(host)["new_connections"] += 1
+
+
+def _record_request(host, latency, failed):
+    with _stats_lock:
+        entry = _host_entry(host)
+        entry["requests"] += 1
+        entry["total_latency"] += latency
+        entry["max_latency"] = max(entry["max_latency"], latency)
+
+        if failed:
+            entry["errors"] += 1
+
+
+# urllib3 only calls connect() when it has no live keep-alive
+# socket to hand out, so counting calls here tells us how many
+# requests actually reused a connection.
+class _CountingHTTPConnection(HTTPConnection):
+
+    def connect(self):
+        _record_new_connection(self.host)
+        super().connect()
+
+
+class _CountingHTTPSConnection(HTTPSConnection):
+
+    def connect(self):
+        _record_new_connection(self.host)
+        super().connect()
+
+
+class _CountingHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _CountingHTTPConnection
+
+
+class _CountingHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _CountingHTTPSConnection
+
+
+class _PooledAdapter(HTTPAdapter):
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _CountingHTTPConnectionPool,
+            "https": _CountingHTTPSConnectionPool,
+        }
+
+
+# Plain requests.get() never persisted cookies between rows,
+# keep it that way for the shared session.
+class _NoCookiePolicy(cookiejar.DefaultCookiePolicy):
+
+    def set_ok(self, cookie, request):
+        return False
+
+    def return_ok(self, cookie, request):
+        return False
+
+
+# -------------------------
+# SHARED SESSION
+# -------------------------
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+
+    global _session
+
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                session.headers.update(DEFAULT_HEADERS)
+
+                if not HTTP_KEEP_ALIVE:
+                    session.headers["Connection"] = "close"
+
+                session.cookies.set_policy(_NoCookiePolicy())
+
+                adapter = _PooledAdapter(
+                    pool_connections=HTTP_POOL_HOSTS,
+                    pool_maxsize=HTTP_POOL_SIZE,
+                )
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+
+                _session = session
+
+    return _session
+
+
+def http_get(url, headers=None, timeout=None, **kwargs):
+
+    host = urlsplit(url).hostname or ""
+
+    if timeout is None:
+        timeout = (HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT)
+
+    start = time.perf_counter()
+    failed = True
+
+    try:
+        response = get_session().get(
+            url,
+            headers=headers,
+            timeout=timeout,
+            **kwargs
+        )
+        failed = response.status_code >= 400
+        return response
+
+    finally:
+        _record_request(host, time.perf_counter() - start, failed)
+
+
+# -------------------------
+# ASYNC CLIENT
+# -------------------------
+class AsyncHttpClient:
+    """
+    httpx-based counterpart of http_get for the asyncio fast phase.
+
+    Shares configuration, cookie policy and per-host stats with the
+    pooled requests session. Semaphores are bound to the running event
+    loop, so create one client per asyncio.run().
+    """
+
+    def __init__(self, max_in_flight=ASYNC_MAX_IN_FLIGHT, per_host=ASYNC_PER_HOST_LIMIT):
+
+        headers = dict(DEFAULT_HEADERS)
+
+        if not HTTP_KEEP_ALIVE:
+            headers["Connection"] = "close"
+
+        self.per_host = per_host
+
+        self._client = httpx.AsyncClient(
+            headers=headers,
+            cookies=cookiejar.CookieJar(policy=_NoCookiePolicy()),
+            timeout=httpx.Timeout(HTTP_READ_TIMEOUT, connect=HTTP_CONNECT_TIMEOUT),
+            limits=httpx.Limits(
+                max_connections=max_in_flight,
+                max_keepalive_connections=max_in_flight,
+            ),
+            follow_redirects=True,
+        )
+        self._in_flight = asyncio.Semaphore(max_in_flight)
+        self._host_slots = {}
+
+    def _host_slot(self, host):
+
+        slot = self._host_slots.get(host)
+
+        if slot is None:
+            slot = asyncio.Semaphore(self.per_host)
+            self._host_slots[host] = slot
+
+        return slot
+
+    @staticmethod
+    def _trace_for(host):
+
+        async def trace(event_name, info):
+            if event_name == "connection.connect_tcp.started":
+                _record_new_connection(host)
+
+        return trace
+
+    @asynccontextmanager
+    async def stream(self, url):
+
+        host = urlsplit(url).hostname or ""
+
+        async with self._in_flight, self._host_slot(host):
+
+            start = time.perf_counter()
+            failed = True
+
+            try:
+                async with self._client.stream(
+                    "GET",
+                    url,
+                    extensions={"trace": self._trace_for(host)}
+                ) as response:
+                    failed = response.status_code >= 400
+                    yield response
+
+            finally:
+                _record_request(host, time.perf_counter() - start, failed)
+
+    async def get(self, url):
+
+        async with self.stream(url) as response:
+            await response.aread()
+            return response
+
+    async def aclose(self):
+        await self._client.aclose()
+
+
+# -------------------------
+# REPORTING
+# -------------------------
+def get_http_stats():
+
+    with _stats_lock:
+        return {host: dict(entry) for host, entry in _host_stats.items()}
+
+
+def reset_http_stats():
+
+    with _stats_lock:
+        _host_stats.clear()
+
+
+def format_http_stats():
+
+    lines = []
+
+    for host, entry in sorted(get_http_stats().items()):
+        requests_made = entry["requests"]
+
+        if not requests_made:
+            continue
+
+        reused = max(requests_made - entry["new_connections"], 0)
+        avg_ms = entry["total_latency"] / requests_made * 1000
+
+        lines.append(
+            f"{host} | requests: {requests_made}"
+            f" | errors: {entry['errors']}"
+            f" | avg: {avg_ms:.0f} ms"
+            f" | max: {entry['max_latency'] * 1000:.0f} ms"
+            f" | new conns: {entry['new_connections']}"
+            f" | reused: {reused} ({reused / requests_made:.0%})"
+        )
+
+    return lines
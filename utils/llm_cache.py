@@ -0,0 +1,90 @@
+import hashlib
+import json
+import os
+import re
+import threading
+
+from utils.disk_cache import DiskCache
+
+
+# -------------------------
+# CONFIGURATION
+# -------------------------
+LLM_CACHE_PATH = os.getenv(
+    "LLM_CACHE_PATH",
+    os.path.join("data", "cache", "llm_cache.sqlite3")
+)
+LLM_CACHE_MAX_MB = int(os.getenv("LLM_CACHE_MAX_MB", "50"))
+LLM_CACHE_TTL_DAYS = int(os.getenv("LLM_CACHE_TTL_DAYS", "180"))
+LLM_CACHE_BYPASS = os.getenv("LLM_CACHE_BYPASS", "0") == "1"
+
+# Same cut-off llm_project_context_match applies before prompting
+POST_TEXT_LIMIT = 1500
+
+_cache = None
+_cache_lock = threading.Lock()
+
+_stats_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0}
+
+
+def _get_cache():
+
+    global _cache
+
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = DiskCache(LLM_CACHE_PATH, LLM_CACHE_MAX_MB * 1024 * 1024)
+
+    return _cache
+
+
+def _normalize(text):
+    return re.sub(r"\s+", " ", (text or "").lower()).strip()
+
+
+def verdict_key(project_name, linkedin_text, version_tag):
+    """Hash of (model/prompt version, normalized title, normalized truncated post)."""
+
+    payload = "\x1f".join([
+        version_tag,
+        _normalize(project_name),
+        _normalize((linkedin_text or "")[:POST_TEXT_LIMIT]),
+    ])
+
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def get_cached_verdict(project_name, linkedin_text, version_tag):
+
+    if LLM_CACHE_BYPASS:
+        return None
+
+    blob = _get_cache().get(verdict_key(project_name, linkedin_text, version_tag))
+
+    with _stats_lock:
+        _stats["hits" if blob is not None else "misses"] += 1
+
+    return json.loads(blob) if blob is not None else None
+
+
+def store_verdict(project_name, linkedin_text, version_tag, verdict):
+
+    if LLM_CACHE_BYPASS:
+        return
+
+    _get_cache().set(
+        verdict_key(project_name, linkedin_text, version_tag),
+        json.dumps({
+            "match": verdict["match"],
+            "confidence": verdict["confidence"],
+            "reason": verdict["reason"],
+        }).encode("utf-8"),
+        LLM_CACHE_TTL_DAYS * 24 * 60 * 60
+    )
+
+
+def get_llm_cache_stats():
+    with _stats_lock:
+        return dict(_stats)
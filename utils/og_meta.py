@@ -0,0 +1,175 @@
+import html
+import os
+import re
+
+from bs4 import BeautifulSoup
+
+
+# -------------------------
+# CONFIGURATION
+# -------------------------
+# Give up on head-only parsing if </head> has not shown up by then
+OG_HEAD_MAX_BYTES = int(os.getenv("OG_HEAD_MAX_BYTES", str(512 * 1024)))
+
+# After </head> the rest of the body is read (not parsed) so the
+# keep-alive connection can go back to the pool. Bodies bigger than
+# this are cut off instead, which drops the connection.
+OG_DRAIN_LIMIT = int(os.getenv("OG_DRAIN_LIMIT", str(512 * 1024)))
+
+_CHUNK_SIZE = 16 * 1024
+
+_HEAD_END_RE = re.compile(r"</head\s*>|<body[\s>]", re.IGNORECASE)
+_HEAD_END_BYTES_RE = re.compile(rb"</head\s*>|<body[\s>]", re.IGNORECASE)
+_META_TAG_RE = re.compile(r"<meta\b([^>]*)>", re.IGNORECASE)
+_ATTR_RE = re.compile(
+    r"""([a-zA-Z_:][-\w:.]*)\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s"'>]+))"""
+)
+
+
+# -------------------------
+# HEAD-ONLY EXTRACTION
+# -------------------------
+def _parse_meta_tags(head_html):
+
+    og = {}
+
+    for tag in _META_TAG_RE.finditer(head_html):
+        attrs = {}
+
+        for name, dq, sq, bare in _ATTR_RE.findall(tag.group(1)):
+            attrs[name.lower()] = dq or sq or bare
+
+        prop = attrs.get("property", "")
+
+        if prop.startswith("og:"):
+            og[prop] = html.unescape(attrs.get("content", ""))
+
+    return og
+
+
+def parse_og_meta_full(page_html):
+
+    soup = BeautifulSoup(page_html, "html.parser")
+
+    og = {}
+    for tag in soup.find_all("meta"):
+        if tag.get("property", "").startswith("og:"):
+            og[tag["property"]] = tag.get("content", "")
+
+    return og
+
+
+def extract_og_meta(page_html):
+    """
+    Read og:* properties from the <head> of an HTML string without
+    building a DOM. Falls back to a full BeautifulSoup parse when the
+    head cannot be delimited or holds no og: tags.
+    """
+
+    if not page_html:
+        return {}
+
+    head_end = _HEAD_END_RE.search(page_html)
+
+    if head_end:
+        og = _parse_meta_tags(page_html[:head_end.start()])
+
+        if og:
+            return og
+
+    return parse_og_meta_full(page_html)
+
+
+# -------------------------
+# STREAMING EXTRACTION
+# -------------------------
+class _HeadScanner:
+
+    def __init__(self, encoding):
+        self.encoding = encoding or "utf-8"
+        self.buffer = bytearray()
+        self.og = None
+
+    def feed(self, chunk):
+        """Buffer one chunk; returns True once no more chunks need parsing."""
+
+        search_from = max(len(self.buffer) - 16, 0)
+        self.buffer.extend(chunk)
+
+        head_end = _HEAD_END_BYTES_RE.search(self.buffer, search_from)
+
+        if head_end:
+            head_html = self.buffer[:head_end.start()].decode(self.encoding, errors="replace")
+            self.og = _parse_meta_tags(head_html) or None
+            return True
+
+        return len(self.buffer) > OG_HEAD_MAX_BYTES
+
+    def full_parse(self):
+        return parse_og_meta_full(self.buffer.decode(self.encoding, errors="replace"))
+
+
+def _drain(chunks):
+
+    remaining = OG_DRAIN_LIMIT
+
+    for chunk in chunks:
+        remaining -= len(chunk)
+
+        if remaining < 0:
+            break
+
+
+def stream_og_meta(response):
+    """
+    Same as extract_og_meta for a requests response opened with
+    stream=True, but stops reading the body once </head> arrives.
+    """
+
+    scanner = _HeadScanner(response.encoding)
+    chunks = response.iter_content(chunk_size=_CHUNK_SIZE)
+
+    try:
+        for chunk in chunks:
+            if scanner.feed(chunk):
+                break
+
+        if scanner.og:
+            _drain(chunks)
+            return scanner.og
+
+        # No usable head: read what is left and do the full parse
+        for chunk in chunks:
+            scanner.buffer.extend(chunk)
+
+        return scanner.full_parse()
+
+    finally:
+        response.close()
+
+
+async def async_stream_og_meta(response):
+    """stream_og_meta for an httpx response opened with client.stream()."""
+
+    scanner = _HeadScanner(response.charset_encoding)
+    chunks = response.aiter_bytes(chunk_size=_CHUNK_SIZE)
+
+    async for chunk in chunks:
+        if scanner.feed(chunk):
+            break
+
+    if scanner.og:
+        remaining = OG_DRAIN_LIMIT
+
+        async for chunk in chunks:
+            remaining -= len(chunk)
+
+            if remaining < 0:
+                break
+
+        return scanner.og
+
+    async for chunk in chunks:
+        scanner.buffer.extend(chunk)
+
+    return scanner.full_parse()
@@ -0,0 +1,198 @@
+import glob
+import os
+import threading
+from collections import deque
+
+import pandas as pd
+
+from utils.project_matcher import tokenize
+
+
+# -------------------------
+# CONFIGURATION
+# -------------------------
+CATALOG_SOURCES = os.getenv(
+    "CATALOG_SOURCES",
+    os.path.join("data", "outputs", "Final_Evaluation_*.csv")
+)
+
+# One- or two-word titles ("Excel Basics") show up inside unrelated posts
+CATALOG_MIN_TOKENS = int(os.getenv("CATALOG_MIN_TOKENS", "3"))
+
+
+# -------------------------
+# AHO-CORASICK OVER TOKENS
+# -------------------------
+class TitleAutomaton:
+    """
+    Aho-Corasick automaton whose alphabet is normalized title tokens,
+    so one left-to-right pass over a post's tokens reports every
+    catalog title it contains, whatever the catalog size.
+    """
+
+    def __init__(self, patterns):
+
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [()]
+
+        for tokens, titles in patterns.items():
+
+            state = 0
+
+            for token in tokens:
+                nxt = self._goto[state].get(token)
+
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][token] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(())
+
+                state = nxt
+
+            self._out[state] += tuple(titles)
+
+        queue = deque(self._goto[0].values())
+
+        while queue:
+
+            state = queue.popleft()
+
+            for token, nxt in self._goto[state].items():
+
+                queue.append(nxt)
+
+                fail = self._fail[state]
+                while fail and token not in self._goto[fail]:
+                    fail = self._fail[fail]
+
+                self._fail[nxt] = self._goto[fail].get(token, 0)
+                self._out[nxt] += self._out[self._fail[nxt]]
+
+    def search(self, tokens):
+
+        found = set()
+        state = 0
+
+        for token in tokens:
+
+            while state and token not in self._goto[state]:
+                state = self._fail[state]
+
+            state = self._goto[state].get(token, 0)
+            found.update(self._out[state])
+
+        return found
+
+
+# -------------------------
+# PROJECT CATALOG
+# -------------------------
+class ProjectCatalog:
+    """Every project title seen so far, searchable in one pass per post."""
+
+    def __init__(self, titles=()):
+
+        self._lock = threading.Lock()
+        self._patterns = {}
+        self._automaton = None
+
+        self.add_many(titles)
+
+    def __len__(self):
+        return len(self._patterns)
+
+    def add(self, title):
+        self.add_many([title])
+
+    def add_many(self, titles):
+
+        with self._lock:
+            for title in titles:
+
+                # Coursera's generic page title, not a project
+                if not isinstance(title, str) or title.rstrip().endswith("| Coursera"):
+                    continue
+
+                tokens = tuple(tokenize(title))
+
+                if len(tokens) < CATALOG_MIN_TOKENS:
+                    continue
+
+                known = self._patterns.setdefault(tokens, set())
+
+                if title not in known:
+                    known.add(title)
+                    self._automaton = None
+
+    def _get_automaton(self):
+
+        with self._lock:
+            if self._automaton is None:
+                self._automaton = TitleAutomaton(self._patterns)
+
+            return self._automaton
+
+    def find_mentions(self, text):
+        """Catalog titles whose normalized token sequence occurs in text."""
+
+        if not text:
+            return set()
+
+        return self._get_automaton().search(tokenize(text))
+
+    def other_projects_mentioned(self, text, own_title):
+        """
+        Catalog titles mentioned in text other than own_title. Titles
+        that contain own_title or are contained in it are not counted:
+        mentioning the submitted project also "mentions" those.
+        """
+
+        own_tokens = tuple(tokenize(own_title or ""))
+
+        return {
+            title for title in self.find_mentions(text)
+            if not _overlaps(tuple(tokenize(title)), own_tokens)
+        }
+
+
+def _contains(tokens, part):
+    n = len(part)
+    return any(tokens[i:i + n] == part for i in range(len(tokens) - n + 1))
+
+
+def _overlaps(a, b):
+    return bool(a) and bool(b) and (_contains(a, b) or _contains(b, a))
+
+
+def load_catalog_titles(pattern=CATALOG_SOURCES):
+
+    titles = set()
+
+    for path in sorted(glob.glob(pattern)):
+        try:
+            df = pd.read_csv(path, usecols=["Coursera Project"])
+        except (ValueError, OSError):
+            continue
+
+        titles.update(df["Coursera Project"].dropna().astype(str))
+
+    return titles
+
+
+_catalog = None
+_catalog_lock = threading.Lock()
+
+
+def get_project_catalog():
+
+    global _catalog
+
+    if _catalog is None:
+        with _catalog_lock:
+            if _catalog is None:
+                _catalog = ProjectCatalog(load_catalog_titles())
+
+    return _catalog
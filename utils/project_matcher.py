@@ -0,0 +1,164 @@
+import os
+import re
+import threading
+import unicodedata
+
+
+# -------------------------
+# CONFIGURATION
+# -------------------------
+# Fraction of the title's content words the post must contain to count
+# as a project mention without asking the LLM
+PROJECT_MATCH_THRESHOLD = float(os.getenv("PROJECT_MATCH_THRESHOLD", "1.0"))
+
+# Function words plus the filler that guided-project titles swap freely
+# ("with" / "using", "intro to" / "introduction to")
+STOP_WORDS = frozenset("""
+a an and the of for to in on at by from with without into onto via using use
+you your my our how what is are be this that its it as or vs
+""".split())
+
+_HASHTAG_RE = re.compile(r"#(\w+)")
+_CAMEL_RE = re.compile(r"(?<=[a-z])(?=[A-Z])|(?<=[A-Z])(?=[A-Z][a-z])|(?<=[A-Za-z])(?=\d)|(?<=\d)(?=[A-Za-z])")
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+# -------------------------
+# NORMALIZATION
+# -------------------------
+def _strip_accents(text):
+    return "".join(
+        ch for ch in unicodedata.normalize("NFKD", text)
+        if not unicodedata.combining(ch)
+    )
+
+
+def _split_hashtag(match):
+    # #DataAnalysisWithPandas -> Data Analysis With Pandas
+    return " " + _CAMEL_RE.sub(" ", match.group(1)) + " "
+
+
+def stem(token):
+    """Plural folding only; titles and posts disagree on little else."""
+
+    if len(token) > 4 and token.endswith("ies"):
+        return token[:-3] + "y"
+
+    if len(token) > 4 and token.endswith(("ches", "shes", "sses", "xes")):
+        return token[:-2]
+
+    if len(token) > 3 and token.endswith("s") and not token.endswith(("ss", "us", "is")):
+        return token[:-1]
+
+    return token
+
+
+def tokenize(text):
+    """Normalized content tokens, in order. Emoji and punctuation drop out."""
+
+    text = _strip_accents(text or "")
+    text = _HASHTAG_RE.sub(_split_hashtag, text)
+    text = text.replace("&", " and ").lower()
+
+    return [
+        stem(token)
+        for token in _TOKEN_RE.findall(text)
+        if token not in STOP_WORDS
+    ]
+
+
+# -------------------------
+# COMPILED MATCHER
+# -------------------------
+class ProjectMatcher:
+    """
+    One project title, normalized once. score(text) is the fraction of
+    the title's content tokens found in the text, 1.0 for a full match
+    in any order.
+    """
+
+    def __init__(self, title):
+
+        self.title = title
+        self.tokens = tuple(dict.fromkeys(tokenize(title)))
+        self.token_set = frozenset(self.tokens)
+
+        # Longest piece (pluralized title word, or stop word) a
+        # lowercase hashtag can be split into
+        self._max_piece_len = max([len(t) + 3 for t in self.tokens] + [len(w) for w in STOP_WORDS])
+
+    def _segment(self, token):
+        """Split a run-together token (#dataanalysis) into title words, or None."""
+
+        n = len(token)
+        parts = [None] * (n + 1)
+        parts[0] = []
+
+        for end in range(1, n + 1):
+            for start in range(max(0, end - self._max_piece_len), end):
+
+                if parts[start] is None:
+                    continue
+
+                word = token[start:end]
+                candidate = word if word in self.token_set else stem(word)
+
+                if candidate in self.token_set or word in STOP_WORDS:
+                    parts[end] = parts[start] + ([candidate] if candidate in self.token_set else [])
+                    break
+
+        return parts[n]
+
+    def _found(self, text_tokens):
+
+        found = set(self.token_set.intersection(text_tokens))
+
+        if len(found) == len(self.token_set):
+            return found
+
+        # "Power BI" in the post vs "PowerBI" in the title
+        found |= self.token_set.intersection(
+            a + b for a, b in zip(text_tokens, text_tokens[1:])
+        )
+
+        # "#dataanalysis" style tags
+        for token in text_tokens:
+            if len(token) > 6 and token not in self.token_set:
+                found.update(self._segment(token) or ())
+
+        return found
+
+    def score(self, text):
+
+        if not self.token_set or not text:
+            return 0.0
+
+        return len(self._found(tokenize(text))) / len(self.token_set)
+
+    def matches(self, text, threshold=PROJECT_MATCH_THRESHOLD):
+        return self.score(text) >= threshold
+
+
+_matchers = {}
+_matchers_lock = threading.Lock()
+
+
+def get_matcher(title):
+
+    matcher = _matchers.get(title)
+
+    if matcher is None:
+        with _matchers_lock:
+            matcher = _matchers.get(title)
+            if matcher is None:
+                matcher = _matchers[title] = ProjectMatcher(title)
+
+    return matcher
+
+
+def project_match_score(text, title):
+
+    if not text or not title:
+        return 0.0
+
+    return get_matcher(title).score(text)
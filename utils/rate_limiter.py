@@ -0,0 +1,158 @@
+import heapq
+import math
+import threading
+import time
+
+
+# -------------------------
+# TOKEN BUCKET RATE LIMITER
+# -------------------------
+class RateLimiter:
+    """
+    Two token buckets (requests per minute and tokens per minute) shared
+    by every thread that calls the API. A 429 shrinks the effective rate
+    and pauses callers briefly; successes let it grow back to the quota.
+    """
+
+    def __init__(self, rpm, tpm):
+
+        self.rpm = max(1, rpm)
+        self.tpm = max(1, tpm)
+
+        self._lock = threading.Lock()
+        self._request_tokens = float(self.rpm)
+        self._token_tokens = float(self.tpm)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+
+        self.rate_scale = 1.0
+        self.avg_latency = None
+
+        self.throttle_events = 0
+        self.waited_seconds = 0.0
+
+    def _refill(self, now):
+
+        elapsed = now - self._updated
+        self._updated = now
+
+        per_second = self.rate_scale / 60
+        self._request_tokens = min(self.rpm, self._request_tokens + elapsed * self.rpm * per_second)
+        self._token_tokens = min(self.tpm, self._token_tokens + elapsed * self.tpm * per_second)
+
+    def acquire(self, tokens=1):
+
+        # A single request bigger than the whole budget is let through
+        # once the bucket is full rather than blocking forever.
+        tokens = min(tokens, self.tpm)
+        start = time.monotonic()
+
+        while True:
+
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+
+                if now >= self._paused_until and self._request_tokens >= 1 and self._token_tokens >= tokens:
+                    self._request_tokens -= 1
+                    self._token_tokens -= tokens
+                    self.waited_seconds += now - start
+                    return
+
+                per_second = self.rate_scale / 60
+                wait = max(
+                    self._paused_until - now,
+                    (1 - self._request_tokens) / (self.rpm * per_second),
+                    (tokens - self._token_tokens) / (self.tpm * per_second),
+                    0.01
+                )
+
+            time.sleep(min(wait, 1.0))
+
+    def on_success(self, latency):
+
+        with self._lock:
+            self.rate_scale = min(1.0, self.rate_scale + 0.05)
+
+            if self.avg_latency is None:
+                self.avg_latency = latency
+            else:
+                self.avg_latency = 0.8 * self.avg_latency + 0.2 * latency
+
+    def on_throttled(self, pause_seconds):
+
+        with self._lock:
+            self.throttle_events += 1
+            self.rate_scale = max(0.1, self.rate_scale * 0.7)
+            self._paused_until = max(self._paused_until, time.monotonic() + pause_seconds)
+
+    def target_concurrency(self, max_workers):
+        """Callers needed to keep the allowed request rate busy at the observed latency."""
+
+        with self._lock:
+            latency = self.avg_latency or 1.0
+            requests_per_second = self.rpm * self.rate_scale / 60
+
+        return max(1, min(max_workers, math.ceil(requests_per_second * latency) + 1))
+
+
+# -------------------------
+# DELAYED RETRY SCHEDULER
+# -------------------------
+class RetryScheduler:
+    """
+    Puts tasks back on a queue.Queue after a delay. The failed attempt
+    is marked task_done only after the retry is enqueued, so
+    queue.join() cannot return while a retry is still waiting.
+    """
+
+    def __init__(self, target_queue):
+
+        self.target_queue = target_queue
+
+        self._heap = []
+        self._counter = 0
+        self._cond = threading.Condition()
+        self._stopped = False
+        self._thread = threading.Thread(target=self._run, name="retry-scheduler", daemon=True)
+        self._thread.start()
+
+    def schedule(self, task, delay):
+
+        with self._cond:
+            self._counter += 1
+            heapq.heappush(self._heap, (time.monotonic() + delay, self._counter, task))
+            self._cond.notify()
+
+    def pending(self):
+
+        with self._cond:
+            return len(self._heap)
+
+    def _run(self):
+
+        while True:
+
+            with self._cond:
+
+                while not self._stopped and (
+                    not self._heap or self._heap[0][0] > time.monotonic()
+                ):
+                    timeout = self._heap[0][0] - time.monotonic() if self._heap else None
+                    self._cond.wait(timeout)
+
+                if self._stopped:
+                    return
+
+                _, _, task = heapq.heappop(self._heap)
+
+            self.target_queue.put(task)
+            self.target_queue.task_done()
+
+    def stop(self):
+
+        with self._cond:
+            self._stopped = True
+            self._cond.notify()
+
+        self._thread.join()
@@ -0,0 +1,141 @@
+import json
+import os
+import threading
+import zlib
+from urllib.parse import urlsplit
+
+from utils.disk_cache import DiskCache
+
+
+# -------------------------
+# CONFIGURATION
+# -------------------------
+HTTP_CACHE_PATH = os.getenv(
+    "HTTP_CACHE_PATH",
+    os.path.join("data", "cache", "http_cache.sqlite3")
+)
+HTTP_CACHE_MAX_MB = int(os.getenv("HTTP_CACHE_MAX_MB", "200"))
+HTTP_CACHE_BYPASS = os.getenv("HTTP_CACHE_BYPASS", "0") == "1"
+
+DAY = 24 * 60 * 60
+
+# Issued Coursera certificates never change; LinkedIn posts can be
+# edited, so they are re-checked more often.
+DOMAIN_TTLS = {
+    "coursera.org": int(os.getenv("HTTP_CACHE_TTL_COURSERA", str(30 * DAY))),
+    "linkedin.com": int(os.getenv("HTTP_CACHE_TTL_LINKEDIN", str(1 * DAY))),
+}
+DEFAULT_TTL = int(os.getenv("HTTP_CACHE_TTL_DEFAULT", str(60 * 60)))
+
+# Only what the tools actually read back
+CACHED_HEADERS = ("content-type", "last-modified", "etag")
+
+
+_cache = None
+_cache_lock = threading.Lock()
+_bypass = HTTP_CACHE_BYPASS
+
+_stats_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0, "stores": 0}
+
+
+def set_cache_bypass(bypass):
+
+    global _bypass
+    _bypass = bypass
+
+
+def _get_cache():
+
+    global _cache
+
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = DiskCache(HTTP_CACHE_PATH, HTTP_CACHE_MAX_MB * 1024 * 1024)
+
+    return _cache
+
+
+def ttl_for(url):
+
+    host = (urlsplit(url).hostname or "").lower()
+
+    for domain, ttl in DOMAIN_TTLS.items():
+        if host == domain or host.endswith("." + domain):
+            return ttl
+
+    return DEFAULT_TTL
+
+
+def _count(name):
+    with _stats_lock:
+        _stats[name] += 1
+
+
+def _load(key):
+
+    if _bypass:
+        return None
+
+    blob = _get_cache().get(key)
+
+    if blob is None:
+        _count("misses")
+        return None
+
+    _count("hits")
+    return json.loads(zlib.decompress(blob))
+
+
+def _store(key, url, entry):
+
+    if _bypass:
+        return
+
+    blob = zlib.compress(json.dumps(entry).encode("utf-8"))
+    _get_cache().set(key, blob, ttl_for(url))
+    _count("stores")
+
+
+# -------------------------
+# FULL PAGES (Coursera)
+# -------------------------
+def get_cached_page(url):
+    return _load("page:" + url)
+
+
+def store_page(url, status_code, headers, body, final_url=None):
+
+    if status_code != 200:
+        return
+
+    _store("page:" + url, url, {
+        "status": status_code,
+        "headers": {h: headers[h] for h in CACHED_HEADERS if h in headers},
+        "final_url": final_url or url,
+        "body": body,
+    })
+
+
+# -------------------------
+# OG METADATA ONLY (LinkedIn)
+# -------------------------
+def get_cached_og(url):
+    return _load("og:" + url)
+
+
+def store_og(url, status_code, og):
+
+    if status_code != 200 or not og:
+        return
+
+    _store("og:" + url, url, {
+        "status": status_code,
+        "og": og,
+    })
+
+
+def get_cache_stats():
+    with _stats_lock:
+        return dict(_stats)
@@ -0,0 +1,162 @@
+import csv
+import math
+
+
+# -------------------------
+# RESULT SCHEMA
+# -------------------------
+# (attribute, column, Parquet type) for every field of a result. The
+# first seven columns are the evaluation output / live log columns.
+RESULT_SCHEMA = (
+    ("roll_number", "Roll Number", "string"),
+    ("full_name", "Full Name", "string"),
+    ("coursera_project", "Coursera Project", "string"),
+    ("completion_date", "Certificate Completion Date", "string"),
+    ("project_mention_match", "Project Mention Match", "bool"),
+    ("final_verdict", "Final Verdict", "string"),
+    ("failure_reason", "Failure Reason", "string"),
+    ("duplicate_certificate", "Duplicate Certificate", "bool"),
+    ("llm_context_match", "LLM Context Match", "bool"),
+    ("llm_confidence", "LLM Confidence", "int64"),
+    ("llm_status", "LLM Status", "string"),
+    ("prefilter_score", "Prefilter Score", "float64"),
+    ("project_match_score", "Project Match Score", "float64"),
+    ("other_projects", "Other Projects Mentioned", "string"),
+    ("prompt_version", "Prompt Version", "string"),
+)
+
+RESULT_COLUMNS = tuple(column for _, column, _ in RESULT_SCHEMA)
+OUTPUT_COLUMNS = RESULT_COLUMNS[:7]
+
+_ATTRIBUTES = {column: attribute for attribute, column, _ in RESULT_SCHEMA}
+_TYPES = {column: arrow_type for _, column, arrow_type in RESULT_SCHEMA}
+
+
+# -------------------------
+# RESULT RECORD
+# -------------------------
+class ResultRecord:
+    """One row's evaluation result; filled in by the FAST phase, completed by the LLM phase."""
+
+    __slots__ = tuple(attribute for attribute, _, _ in RESULT_SCHEMA)
+
+    def __init__(self, roll_number, full_name, coursera_project="-", completion_date="-",
+                 project_mention_match="-", final_verdict=None, failure_reason="",
+                 duplicate_certificate=False, llm_context_match=False, llm_confidence=0,
+                 llm_status=None, prefilter_score=None, project_match_score=None,
+                 other_projects="", prompt_version=None):
+
+        self.roll_number = roll_number
+        self.full_name = full_name
+        self.coursera_project = coursera_project
+        self.completion_date = completion_date
+        self.project_mention_match = project_mention_match
+        self.final_verdict = final_verdict
+        self.failure_reason = failure_reason
+        self.duplicate_certificate = duplicate_certificate
+        self.llm_context_match = llm_context_match
+        self.llm_confidence = llm_confidence
+        self.llm_status = llm_status
+        self.prefilter_score = prefilter_score
+        self.project_match_score = project_match_score
+        self.other_projects = other_projects
+        self.prompt_version = prompt_version
+
+    @classmethod
+    def from_dict(cls, entry):
+        """Inverse of to_dict; missing columns keep their defaults."""
+
+        return cls(**{
+            _ATTRIBUTES[column]: value
+            for column, value in entry.items()
+            if column in _ATTRIBUTES
+        })
+
+    def to_dict(self):
+        """Column name -> value, the form checkpoints are stored in."""
+        return {column: getattr(self, _ATTRIBUTES[column]) for column in RESULT_COLUMNS}
+
+    def output_row(self):
+        """Values of the OUTPUT_COLUMNS, in order (live log row)."""
+        return [getattr(self, _ATTRIBUTES[column]) for column in OUTPUT_COLUMNS]
+
+    def to_api(self):
+        return {
+            "roll_number": self.roll_number,
+            "full_name": self.full_name,
+            "project": self.coursera_project,
+            "completion_date": self.completion_date,
+            "verdict": self.final_verdict,
+            "reason": self.failure_reason
+        }
+
+
+# -------------------------
+# COLUMNAR OUTPUT
+# -------------------------
+def result_columns(records, columns=OUTPUT_COLUMNS):
+    """Column name -> list of values, read straight off the records."""
+
+    records = list(records)
+
+    return {
+        column: [getattr(record, _ATTRIBUTES[column]) for record in records]
+        for column in columns
+    }
+
+
+def _is_missing(value):
+    return value is None or (isinstance(value, float) and math.isnan(value))
+
+
+def schema_value(value, arrow_type):
+    """value coerced to its schema type; None where it does not have one ("-" in a bool column)."""
+
+    if _is_missing(value):
+        return None
+
+    if arrow_type == "string":
+        return str(value)
+
+    if arrow_type == "bool":
+        return bool(value) if isinstance(value, bool) or type(value).__name__ == "bool_" else None
+
+    try:
+        return int(value) if arrow_type == "int64" else float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def write_results(records, path, columns=OUTPUT_COLUMNS):
+    """
+    Write records to path, column by column: Parquet (typed per
+    RESULT_SCHEMA) for a .parquet path, else CSV with a header row.
+    """
+
+    data = result_columns(records, columns)
+
+    if path.endswith(".parquet"):
+
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        table = pa.table({
+            column: pa.array(
+                [schema_value(value, _TYPES[column]) for value in values],
+                # pyarrow spells the boolean type bool_
+                type=getattr(pa, "bool_" if _TYPES[column] == "bool" else _TYPES[column])()
+            )
+            for column, values in data.items()
+        })
+
+        pq.write_table(table, path)
+        return
+
+    with open(path, "w", newline="", encoding="utf-8") as f:
+
+        writer = csv.writer(f)
+        writer.writerow(columns)
+        writer.writerows(zip(*(
+            ["" if _is_missing(value) else value for value in values]
+            for values in data.values()
+        )))
@@ -0,0 +1,152 @@
+import csv
+import os
+import threading
+
+from utils.result_record import OUTPUT_COLUMNS
+
+
+# -------------------------
+# CONFIGURATION
+# -------------------------
+# "sheets", "csv" or "none". Without credentials.json the pipeline
+# logs to a local CSV instead of failing at startup.
+RESULT_SINK = os.getenv(
+    "RESULT_SINK",
+    "sheets" if os.path.exists("credentials.json") else "csv"
+)
+LIVE_CSV_PATH = os.getenv(
+    "LIVE_CSV_PATH",
+    os.path.join("data", "outputs", "live_results.csv")
+)
+
+SHEET_HEADERS = list(OUTPUT_COLUMNS)
+
+
+# -------------------------
+# SINK INTERFACE
+# -------------------------
+class ResultSink:
+    """Destination for live per-row results. Backends connect lazily in init()."""
+
+    name = "base"
+
+    def init(self):
+        pass
+
+    def append(self, row_data):
+        raise NotImplementedError
+
+    def flush(self):
+        pass
+
+
+class NullSink(ResultSink):
+
+    name = "none"
+
+    def append(self, row_data):
+        pass
+
+
+class CsvSink(ResultSink):
+
+    name = "csv"
+
+    def __init__(self, path=LIVE_CSV_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = None
+        self._writer = None
+
+    def init(self):
+
+        with self._lock:
+            if self._file is not None:
+                return
+
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+
+            # Append so resumed runs keep the rows logged before the restart
+            is_new = not os.path.exists(self.path) or os.path.getsize(self.path) == 0
+
+            self._file = open(self.path, "a", newline="", encoding="utf-8")
+            self._writer = csv.writer(self._file)
+
+            if is_new:
+                self._writer.writerow(SHEET_HEADERS)
+                self._file.flush()
+
+        print(f"ℹ️ Logging live results to {self.path}")
+
+    def append(self, row_data):
+
+        if self._file is None:
+            self.init()
+
+        with self._lock:
+            self._writer.writerow(row_data)
+            self._file.flush()
+
+    def flush(self):
+
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+                self._writer = None
+
+
+def build_sink(name):
+
+    if name == "sheets":
+        from utils.google_sheet_logger import GoogleSheetSink
+        return GoogleSheetSink()
+
+    if name == "csv":
+        return CsvSink()
+
+    if name == "none":
+        return NullSink()
+
+    raise ValueError(f"Unknown result sink: {name}")
+
+
+# -------------------------
+# ACTIVE SINK
+# -------------------------
+_sink = None
+_sink_lock = threading.Lock()
+
+
+def set_result_sink(sink):
+
+    global _sink
+
+    with _sink_lock:
+        _sink = build_sink(sink) if isinstance(sink, str) else sink
+
+    return _sink
+
+
+def get_result_sink():
+
+    global _sink
+
+    if _sink is None:
+        with _sink_lock:
+            if _sink is None:
+                _sink = build_sink(RESULT_SINK)
+
+    return _sink
+
+
+def init_result_sink():
+    get_result_sink().init()
+
+
+def append_result_live(row_data):
+    get_result_sink().append(row_data)
+
+
+def flush_results_live():
+    get_result_sink().flush()
@@ -0,0 +1,266 @@
+import argparse
+import glob
+import os
+import re
+import uuid
+from datetime import date, datetime
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from utils.result_record import RESULT_SCHEMA, schema_value
+
+
+# -------------------------
+# CONFIGURATION
+# -------------------------
+# One directory per run date (run_date=YYYY-MM-DD), one file per run
+RESULTS_STORE_PATH = os.getenv("RESULTS_STORE_PATH", os.path.join("data", "results"))
+
+
+# -------------------------
+# STORE SCHEMA
+# -------------------------
+# Fixed for every run, whatever the output CSV looked like at the time
+RUN_FIELDS = [
+    pa.field("run_id", pa.string()),
+    pa.field("evaluated_at", pa.timestamp("s")),
+    pa.field("input_file", pa.string()),
+    pa.field("model_version", pa.string()),
+]
+
+# Same key as the checkpoints; a resubmission re-evaluated later gets a
+# new row, and queries with latest=True keep only the newest one
+FINGERPRINT_FIELD = pa.field("fingerprint", pa.string())
+
+STORE_SCHEMA = pa.schema(RUN_FIELDS + [FINGERPRINT_FIELD] + [
+    pa.field(attribute, pa.bool_() if arrow_type == "bool" else getattr(pa, arrow_type)())
+    for attribute, _, arrow_type in RESULT_SCHEMA
+])
+
+_PARTITIONING = ds.partitioning(pa.schema([("run_date", pa.string())]), flavor="hive")
+
+
+def new_run_id():
+    return f"{datetime.now():%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:6]}"
+
+
+# -------------------------
+# WRITE
+# -------------------------
+def _run_values(n, run_id, input_file, model_versions=None, fingerprints=None):
+    """The RUN_FIELDS and fingerprint columns for n rows of one run."""
+
+    evaluated_at = datetime.now().replace(microsecond=0)
+
+    return {
+        "run_id": [run_id] * n,
+        "evaluated_at": [evaluated_at] * n,
+        "input_file": [input_file] * n,
+        "model_version": model_versions or [None] * n,
+        "fingerprint": list(fingerprints) if fingerprints is not None else [None] * n,
+    }
+
+
+def _write_run(values, run_id, run_date, root):
+    """
+    Write values (STORE_SCHEMA field -> column) as
+    run_date=<date>/<run_id>.parquet under root; returns the path.
+    """
+
+    table = pa.Table.from_arrays(
+        [pa.array(values[field.name], type=field.type) for field in STORE_SCHEMA],
+        schema=STORE_SCHEMA
+    )
+
+    directory = os.path.join(root, f"run_date={run_date:%Y-%m-%d}")
+    os.makedirs(directory, exist_ok=True)
+
+    path = os.path.join(directory, f"{run_id}.parquet")
+
+    # Readers never see a half-written file (dot-files are skipped by datasets)
+    temp_path = os.path.join(directory, f".{run_id}.parquet.tmp")
+
+    pq.write_table(table, temp_path)
+    os.replace(temp_path, path)
+
+    return path
+
+
+def append_run(records, run_id, model_version, input_file="",
+               fingerprints=None, run_date=None, root=RESULTS_STORE_PATH):
+    """
+    Store one run's records (with their submission fingerprints, same
+    order) as run_date=<date>/<run_id>.parquet under root. The model
+    version is only recorded on rows the LLM decided; the prompt version
+    comes from each record. Earlier runs are never rewritten. Returns
+    the file path.
+    """
+
+    records = list(records)
+    llm_decided = [record.llm_status == "ok" for record in records]
+
+    values = _run_values(
+        len(records),
+        run_id,
+        input_file,
+        model_versions=[model_version if decided else None for decided in llm_decided],
+        fingerprints=fingerprints
+    )
+
+    for attribute, _, arrow_type in RESULT_SCHEMA:
+        values[attribute] = [schema_value(getattr(record, attribute), arrow_type) for record in records]
+
+    return _write_run(values, run_id, run_date or date.today(), root)
+
+
+def import_csv(path, run_id=None, run_date=None, root=RESULTS_STORE_PATH):
+    """
+    Backfill an old Final_Evaluation_*.csv. Columns outside the schema
+    (e.g. "LLM Reason") are dropped and missing ones left null, as is the
+    fingerprint (old outputs lack the timestamp / certificate link); the
+    run date defaults to the file's modification date.
+    """
+
+    df = pd.read_csv(path)
+    run_id = run_id or os.path.splitext(os.path.basename(path))[0]
+
+    # Straight from the CSV: a column it lacks stays null, not a record default
+    values = _run_values(len(df), run_id, os.path.basename(path))
+
+    for attribute, column, arrow_type in RESULT_SCHEMA:
+        values[attribute] = (
+            [schema_value(value, arrow_type) for value in df[column]]
+            if column in df.columns else [None] * len(df)
+        )
+
+    if run_date is None:
+        run_date = date.fromtimestamp(os.path.getmtime(path))
+
+    return _write_run(values, run_id, run_date, root)
+
+
+# -------------------------
+# QUERY
+# -------------------------
+def query_results(since=None, until=None, columns=None, filter=None, latest=False,
+                  root=RESULTS_STORE_PATH):
+    """
+    Stored rows with since <= run_date <= until (ISO date strings, both
+    optional) as a DataFrame. Only the matching date directories and the
+    requested columns are read; filter is an extra pyarrow expression.
+    With latest=True only the newest row per fingerprint in the range is
+    kept (before filter applies); rows without one are all kept.
+    """
+
+    if not glob.glob(os.path.join(root, "run_date=*", "*.parquet")):
+        return pd.DataFrame(columns=columns or ["run_date"] + STORE_SCHEMA.names)
+
+    dataset = ds.dataset(
+        root,
+        format="parquet",
+        partitioning=_PARTITIONING,
+        schema=STORE_SCHEMA.append(pa.field("run_date", pa.string()))
+    )
+
+    date_range = None
+
+    for condition in (
+        ds.field("run_date") >= str(since) if since else None,
+        ds.field("run_date") <= str(until) if until else None,
+    ):
+        if condition is not None:
+            date_range = condition if date_range is None else date_range & condition
+
+    if not latest:
+        expression = date_range if filter is None else (
+            filter if date_range is None else date_range & filter
+        )
+
+        return dataset.to_table(columns=columns, filter=expression).to_pandas()
+
+    # The newest row of a submission decides whether filter keeps it
+    read_columns = columns
+    if columns is not None:
+        read_columns = list(dict.fromkeys(list(columns) + ["fingerprint", "evaluated_at"]))
+
+    df = dataset.to_table(columns=read_columns, filter=date_range).to_pandas()
+    df = df.sort_values("evaluated_at", kind="stable")
+    df = df[df["fingerprint"].isna() | ~df.duplicated("fingerprint", keep="last")]
+
+    if filter is not None:
+        df = pa.Table.from_pandas(df, preserve_index=False).filter(filter).to_pandas()
+
+    return df.reset_index(drop=True)[columns or df.columns]
+
+
+def reason_category(reason):
+    """
+    A failure reason without its row-specific detail, e.g. "Duplicate
+    certificate (already submitted by roll 42)" -> "Duplicate certificate".
+    """
+
+    if not isinstance(reason, str) or not reason.strip():
+        return ""
+
+    reason = re.sub(r"\s*\(.*\)\s*$", "", reason.strip())
+    reason = reason.split(":", 1)[0]
+
+    return re.sub(r"\d+", "N", reason).strip()
+
+
+def failure_reason_summary(since=None, until=None, root=RESULTS_STORE_PATH):
+    """
+    Row counts per (verdict, reason category), most frequent first; a
+    submission evaluated more than once counts with its latest result.
+    """
+
+    df = query_results(
+        since,
+        until,
+        columns=["final_verdict", "failure_reason"],
+        filter=ds.field("final_verdict") != "PASS",
+        latest=True,
+        root=root
+    )
+
+    if df.empty:
+        return []
+
+    df["reason"] = df["failure_reason"].map(reason_category)
+
+    counts = (
+        df.groupby(["final_verdict", "reason"], dropna=False)
+        .size()
+        .sort_values(ascending=False)
+    )
+
+    return [
+        {"verdict": verdict, "reason": reason, "count": int(count)}
+        for (verdict, reason), count in counts.items()
+    ]
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description="Historical evaluation results store")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    backfill = commands.add_parser("import", help="backfill old Final_Evaluation CSVs")
+    backfill.add_argument("paths", nargs="+")
+
+    summary = commands.add_parser("summary", help="failure reasons over a date range")
+    summary.add_argument("--since", help="first run date (YYYY-MM-DD)")
+    summary.add_argument("--until", help="last run date (YYYY-MM-DD)")
+
+    args = parser.parse_args()
+
+    if args.command == "import":
+        for csv_path in args.paths:
+            print(f"{csv_path} -> {import_csv(csv_path)}")
+
+    else:
+        for entry in failure_reason_summary(args.since, args.until):
+            print(f"{entry['count']:>6}  {entry['verdict']:<8} {entry['reason']}")
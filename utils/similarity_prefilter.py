@@ -0,0 +1,144 @@
+import os
+import re
+import threading
+import zlib
+
+import numpy as np
+from scipy import sparse
+
+
+# -------------------------
+# CONFIGURATION
+# -------------------------
+PREFILTER_ENABLED = os.getenv("PREFILTER_ENABLED", "1") == "1"
+
+# Score >= ACCEPT passes locally, score <= REJECT fails locally, the
+# band in between still goes to the LLM. Local FAIL is off unless
+# PREFILTER_REJECT is set: the historical LLM verdicts contain no
+# non-matches to check a reject threshold against
+# (python -m benchmarks.prefilter_benchmark)
+PREFILTER_ACCEPT = float(os.getenv("PREFILTER_ACCEPT", "0.7"))
+PREFILTER_REJECT = float(os.getenv("PREFILTER_REJECT")) if os.getenv("PREFILTER_REJECT") else None
+
+PREFILTER_NGRAM_MIN = 3
+PREFILTER_NGRAM_MAX = 5
+
+# Hashed feature space; collisions at this size barely move the scores
+PREFILTER_FEATURES = 2 ** 18
+
+DECISION_MATCH = "match"
+DECISION_NO_MATCH = "no_match"
+DECISION_AMBIGUOUS = "ambiguous"
+
+_NON_WORD_RE = re.compile(r"[^a-z0-9]+")
+
+_stats_lock = threading.Lock()
+_stats = {DECISION_MATCH: 0, DECISION_NO_MATCH: 0, DECISION_AMBIGUOUS: 0}
+
+
+# -------------------------
+# CHAR N-GRAM VECTORS
+# -------------------------
+def normalize_text(text):
+    return _NON_WORD_RE.sub(" ", (text or "").lower()).strip()
+
+
+def _feature_ids(text):
+
+    padded = f" {normalize_text(text)} "
+
+    # crc32 rather than hash() so feature ids are stable across runs
+    ids = {
+        zlib.crc32(padded[i:i + n].encode("utf-8")) % PREFILTER_FEATURES
+        for n in range(PREFILTER_NGRAM_MIN, PREFILTER_NGRAM_MAX + 1)
+        for i in range(len(padded) - n + 1)
+    }
+
+    return np.fromiter(sorted(ids), dtype=np.int64, count=len(ids))
+
+
+def binary_ngram_matrix(texts):
+    """One CSR row per text, 1.0 for every char n-gram the text contains."""
+
+    rows = [_feature_ids(text) for text in texts]
+
+    indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+    indptr[1:] = np.cumsum([len(ids) for ids in rows])
+
+    indices = np.concatenate(rows) if rows else np.empty(0, dtype=np.int64)
+
+    return sparse.csr_matrix(
+        (np.ones(len(indices), dtype=np.float32), indices, indptr),
+        shape=(len(rows), PREFILTER_FEATURES)
+    )
+
+
+# -------------------------
+# PREFILTER
+# -------------------------
+class SimilarityPrefilter:
+    """
+    Scores how much of each project title's IDF-weighted n-gram mass
+    appears in its post. Containment instead of cosine: posts are much
+    longer than titles, and only the title has to be covered. The IDF
+    is taken over the title catalog given at construction, so n-grams
+    shared by many titles (" data", "ing") count for little, and a
+    row's score never depends on which other posts were seen first.
+    """
+
+    def __init__(self, titles=(), accept=PREFILTER_ACCEPT, reject=PREFILTER_REJECT):
+
+        self.accept = accept
+        self.reject = reject
+
+        titles = sorted({title for title in titles if isinstance(title, str) and title.strip()})
+        doc_freq = np.zeros(PREFILTER_FEATURES, dtype=np.int64)
+
+        if titles:
+            doc_freq += np.asarray(binary_ngram_matrix(titles).sum(axis=0), dtype=np.int64).ravel()
+
+        # Fixed for the prefilter's lifetime; uniform weights without a catalog
+        self._idf = (np.log((1 + len(titles)) / (1 + doc_freq)) + 1).astype(np.float32)
+
+    def score_batch(self, pairs):
+        """pairs: [(project_title, post_text)] -> float array of scores in [0, 1]."""
+
+        if not pairs:
+            return np.zeros(0)
+
+        titles = binary_ngram_matrix([title for title, _ in pairs])
+        posts = binary_ngram_matrix([text for _, text in pairs])
+
+        weighted = titles.copy()
+        weighted.data = self._idf[titles.indices]
+
+        covered = np.asarray(weighted.multiply(posts).sum(axis=1)).ravel()
+        total = np.asarray(weighted.sum(axis=1)).ravel()
+
+        return np.divide(covered, total, out=np.zeros_like(covered), where=total > 0)
+
+    def decide(self, score):
+
+        if score >= self.accept:
+            return DECISION_MATCH
+
+        if self.reject is not None and score <= self.reject:
+            return DECISION_NO_MATCH
+
+        return DECISION_AMBIGUOUS
+
+    def classify_batch(self, pairs):
+        """Returns [(decision, score)] in input order."""
+
+        decisions = [(self.decide(score), float(score)) for score in self.score_batch(pairs)]
+
+        with _stats_lock:
+            for decision, _ in decisions:
+                _stats[decision] += 1
+
+        return decisions
+
+
+def get_prefilter_stats():
+    with _stats_lock:
+        return dict(_stats)
@@ -0,0 +1,149 @@
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+
+
+# -------------------------
+# SINGLE-FLIGHT CALLS
+# -------------------------
+class SingleFlight:
+    """
+    Coalesces concurrent calls for the same key: the first caller runs
+    the function, everyone else arriving while it runs waits for and
+    shares its result (or exception). With ttl > 0 finished results are
+    also remembered, up to max_entries, so later callers skip the call.
+    """
+
+    def __init__(self, ttl=0, max_entries=10000):
+
+        self.ttl = ttl
+        self.max_entries = max_entries
+
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._async_calls = {}
+        self._results = OrderedDict()
+
+        self.executed = 0
+        self.shared = 0
+
+    def _remembered(self, key):
+
+        entry = self._results.get(key)
+
+        if entry is None:
+            return None
+
+        if entry[0] < time.monotonic():
+            del self._results[key]
+            return None
+
+        self._results.move_to_end(key)
+        return entry
+
+    def _remember(self, key, value):
+
+        if self.ttl <= 0:
+            return
+
+        with self._lock:
+            self._results[key] = (time.monotonic() + self.ttl, value)
+            self._results.move_to_end(key)
+
+            while len(self._results) > self.max_entries:
+                self._results.popitem(last=False)
+
+    def do(self, key, fn):
+
+        with self._lock:
+
+            entry = self._remembered(key)
+            if entry is not None:
+                self.shared += 1
+                return entry[1]
+
+            call = self._calls.get(key)
+
+            if call is not None:
+                self.shared += 1
+                leader = False
+            else:
+                call = self._calls[key] = {"done": threading.Event()}
+                self.executed += 1
+                leader = True
+
+        if not leader:
+            call["done"].wait()
+
+            if "error" in call:
+                raise call["error"]
+
+            return call["value"]
+
+        try:
+            call["value"] = fn()
+            self._remember(key, call["value"])
+            return call["value"]
+
+        except BaseException as e:
+            call["error"] = e
+            raise
+
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+
+            call["done"].set()
+
+    async def do_async(self, key, coro_fn):
+
+        with self._lock:
+
+            entry = self._remembered(key)
+            if entry is not None:
+                self.shared += 1
+                return entry[1]
+
+            future = self._async_calls.get(key)
+
+            if future is not None:
+                self.shared += 1
+                leader = False
+            else:
+                future = self._async_calls[key] = asyncio.get_running_loop().create_future()
+                self.executed += 1
+                leader = True
+
+        if not leader:
+            # shield: a cancelled follower must not cancel the shared call
+            return await asyncio.shield(future)
+
+        try:
+            value = await coro_fn()
+            self._remember(key, value)
+            future.set_result(value)
+            return value
+
+        except BaseException as e:
+            future.set_exception(e)
+
+            # Nobody may be waiting; don't log "exception never retrieved"
+            future.exception()
+            raise
+
+        finally:
+            with self._lock:
+                self._async_calls.pop(key, None)
+
+    def stats(self):
+
+        with self._lock:
+            return {"executed": self.executed, "shared": self.shared}
+
+    def reset(self):
+
+        with self._lock:
+            self._results.clear()
+            self.executed = 0
+            self.shared = 0
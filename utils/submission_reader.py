@@ -0,0 +1,50 @@
+import os
+
+import pandas as pd
+
+from utils.submission_store import roll_key
+
+
+# -------------------------
+# CONFIGURATION
+# -------------------------
+# Rows parsed per read; only one chunk is held in memory at a time
+SUBMISSION_CHUNK_SIZE = int(os.getenv("SUBMISSION_CHUNK_SIZE", "500"))
+
+
+# -------------------------
+# STREAMING READER
+# -------------------------
+def iter_submissions(path, start=0, stop=None, rolls=None, chunk_size=SUBMISSION_CHUNK_SIZE):
+    """
+    Yield (position, record) for the submissions in rows [start, stop)
+    of the CSV, optionally only those whose roll number is in rolls.
+    Position is the 0-based data row in the file; record is a plain
+    dict keyed by column name. The file is read chunk by chunk.
+    """
+
+    start = max(0, start or 0)
+
+    if stop is not None and stop <= start:
+        return
+
+    wanted = {roll_key(roll) for roll in rolls} if rolls else None
+
+    reader = pd.read_csv(
+        path,
+        skiprows=range(1, start + 1),
+        nrows=None if stop is None else stop - start,
+        chunksize=chunk_size
+    )
+
+    position = start
+
+    with reader:
+        for chunk in reader:
+
+            for record in chunk.to_dict("records"):
+
+                if wanted is None or roll_key(record["Roll Number"]) in wanted:
+                    yield position, record
+
+                position += 1
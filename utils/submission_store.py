@@ -0,0 +1,261 @@
+import csv
+import io
+import os
+import threading
+
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+
+# -------------------------
+# CONFIGURATION
+# -------------------------
+SUBMISSIONS_PATH = os.getenv("SUBMISSIONS_PATH", "submission2.csv")
+
+# How often the poller stats the CSV for appended rows
+SUBMISSIONS_RECHECK_SECONDS = float(os.getenv("SUBMISSIONS_RECHECK_SECONDS", "2"))
+
+# A few hundred students submit thousands of rows: names and emails
+# repeat, so they are stored as categoricals
+CATEGORICAL_COLUMNS = ("Email Address", "Full Name")
+
+# Bytes before the parsed offset compared on each poll; if they differ
+# the file was rewritten rather than appended to
+_TAIL_CHECK_BYTES = 256
+
+
+def roll_key(roll_number):
+    return str(roll_number).strip()
+
+
+# -------------------------
+# IMMUTABLE SNAPSHOT
+# -------------------------
+class SubmissionSnapshot:
+    """One fully built table + roll index. Never mutated once published."""
+
+    __slots__ = ("df", "by_roll", "signature", "offset", "header", "tail")
+
+    def __init__(self, df, by_roll, signature, offset, header, tail):
+        self.df = df
+        self.by_roll = by_roll
+        self.signature = signature
+        self.offset = offset
+        self.header = header
+        self.tail = tail
+
+
+def _file_signature(path):
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _complete_records(data):
+    """Length of the prefix of data that ends on a record boundary."""
+
+    end = data.rfind(b"\n") + 1
+
+    # A newline inside a quoted field is not a record boundary
+    while end and data[:end].count(b'"') % 2:
+        end = data.rfind(b"\n", 0, end - 1) + 1
+
+    return end
+
+
+def _compact(df):
+
+    for column in CATEGORICAL_COLUMNS:
+        if column in df.columns:
+            df[column] = df[column].astype("category")
+
+    return df
+
+
+def _index_rows(df, start=0, by_roll=None):
+
+    by_roll = dict(by_roll or {})
+    keys = df["Roll Number"].map(roll_key)
+
+    for roll, positions in keys.groupby(keys, sort=False).indices.items():
+        by_roll[roll] = by_roll.get(roll, ()) + tuple((positions + start).tolist())
+
+    return by_roll
+
+
+def build_snapshot(path):
+
+    signature = _file_signature(path)
+
+    with open(path, "rb") as f:
+        data = f.read()
+
+    offset = _complete_records(data)
+    df = _compact(pd.read_csv(io.BytesIO(data[:offset])))
+
+    return SubmissionSnapshot(
+        df,
+        _index_rows(df),
+        signature,
+        offset,
+        data[:data.find(b"\n") + 1],
+        data[max(0, offset - _TAIL_CHECK_BYTES):offset]
+    )
+
+
+def extend_snapshot(snapshot, path):
+    """Parse only the bytes appended since snapshot; None if the file was rewritten."""
+
+    signature = _file_signature(path)
+
+    if signature[1] < snapshot.offset:
+        return None
+
+    with open(path, "rb") as f:
+        f.seek(max(0, snapshot.offset - len(snapshot.tail)))
+
+        if f.read(len(snapshot.tail)) != snapshot.tail:
+            return None
+
+        appended = f.read()
+
+    end = _complete_records(appended)
+    tail = (snapshot.tail + appended[:end])[-_TAIL_CHECK_BYTES:]
+
+    if not appended[:end].strip():
+        # Nothing complete yet (a row mid-write) or blank lines only
+        return SubmissionSnapshot(
+            snapshot.df, snapshot.by_roll, signature,
+            snapshot.offset + end, snapshot.header, tail
+        )
+
+    new_rows = pd.read_csv(io.BytesIO(snapshot.header + appended[:end]))
+
+    df = pd.concat([snapshot.df, new_rows], ignore_index=True)
+
+    # concat falls back to object when the categories differ
+    for column in CATEGORICAL_COLUMNS:
+        if column in df.columns:
+            df[column] = union_categoricals(
+                [
+                    snapshot.df[column],
+                    # an all-empty column parses as float; match the category dtype
+                    new_rows[column].astype(snapshot.df[column].cat.categories.dtype).astype("category")
+                ],
+                ignore_order=True
+            )
+
+    return SubmissionSnapshot(
+        df,
+        _index_rows(new_rows, start=len(snapshot.df), by_roll=snapshot.by_roll),
+        signature,
+        snapshot.offset + end,
+        snapshot.header,
+        tail
+    )
+
+
+# -------------------------
+# SUBMISSION STORE
+# -------------------------
+class SubmissionStore:
+    """
+    Submissions indexed by roll number. A poller thread applies rows
+    appended to the CSV incrementally (a rewritten file is reloaded in
+    full). Each change builds a new snapshot that is swapped in with a
+    single assignment, so lookups never see a half-loaded table.
+    """
+
+    def __init__(self, path=SUBMISSIONS_PATH):
+
+        self.path = path
+
+        self._snapshot = build_snapshot(path)
+        self._refresh_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._poller = None
+
+    @property
+    def snapshot(self):
+        return self._snapshot
+
+    def refresh(self):
+        """Apply on-disk changes. Returns the number of rows added."""
+
+        with self._refresh_lock:
+
+            snapshot = self._snapshot
+
+            try:
+                if _file_signature(self.path) == snapshot.signature:
+                    return 0
+
+                updated = extend_snapshot(snapshot, self.path)
+
+                if updated is None:
+                    updated = build_snapshot(self.path)
+                    print(f"ℹ️ Reloaded {len(updated.df)} submissions from {self.path}")
+
+            except Exception as e:
+                # Keep serving the last good snapshot (file mid-write, etc.)
+                print("Submission reload ERROR:", e)
+                return 0
+
+            self._snapshot = updated
+
+            return max(0, len(updated.df) - len(snapshot.df))
+
+    def append_records(self, records):
+        """Write submissions to the CSV and make them visible. Returns rows added."""
+
+        with self._refresh_lock:
+
+            columns = list(self._snapshot.df.columns)
+
+            with open(self.path, "a+b") as f:
+                f.seek(0, os.SEEK_END)
+
+                # Don't glue the first new row onto an unterminated last line
+                if f.tell():
+                    f.seek(-1, os.SEEK_END)
+                    needs_newline = f.read(1) != b"\n"
+                else:
+                    needs_newline = False
+
+                buffer = io.StringIO()
+                writer = csv.writer(buffer, lineterminator="\n")
+
+                for record in records:
+                    writer.writerow([record.get(column, "") for column in columns])
+
+                f.write((("\n" if needs_newline else "") + buffer.getvalue()).encode("utf-8"))
+
+        return self.refresh()
+
+    def _poll(self):
+        while not self._stop.wait(SUBMISSIONS_RECHECK_SECONDS):
+            self.refresh()
+
+    def start_polling(self):
+
+        if self._poller is None:
+            self._poller = threading.Thread(target=self._poll, name="submission-poller", daemon=True)
+            self._poller.start()
+
+    def stop_polling(self):
+
+        self._stop.set()
+
+        if self._poller is not None:
+            self._poller.join()
+            self._poller = None
+
+    def rows_for(self, roll_number):
+        """A roll number's submissions as a fresh 0-based DataFrame (empty if unknown)."""
+
+        snapshot = self._snapshot
+        positions = snapshot.by_roll.get(roll_key(roll_number), ())
+
+        return snapshot.df.iloc[list(positions)].reset_index(drop=True)
+
+    def memory_usage(self):
+        return int(self._snapshot.df.memory_usage(deep=True).sum())
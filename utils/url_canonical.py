@@ -0,0 +1,103 @@
+import re
+from urllib.parse import urlsplit
+
+
+# -------------------------
+# URL EXTRACTION
+# -------------------------
+# Form answers sometimes wrap the link in text ("Nvidia: ... - https://...")
+# or paste two links; the first URL-looking token is used
+_URL_RE = re.compile(r"(?:https?://)?(?:[a-z0-9-]+\.)*[a-z0-9-]+\.[a-z]{2,}/\S*", re.IGNORECASE)
+
+_TRAILING_PUNCTUATION = ".,;:)]}>'\""
+
+_COURSERA_VERIFY_RE = re.compile(
+    r"^/(?:account/accomplishments/)?(?:verify|certificate)/([A-Za-z0-9]{8,})/?$"
+    r"|^/api/certificate\.v1/pdf/([A-Za-z0-9]{8,})/?$",
+    re.IGNORECASE
+)
+_COURSERA_RECORDS_RE = re.compile(r"^/account/accomplishments/records/([A-Za-z0-9]{8,})/?$", re.IGNORECASE)
+_COURSERA_SHARE_RE = re.compile(r"^/share/([0-9a-f]{32})", re.IGNORECASE)
+
+_LINKEDIN_HOSTS = ("linkedin.com", "lnkd.in")
+
+
+def _split_url(raw):
+
+    match = _URL_RE.search((raw or "").strip())
+
+    if not match:
+        return None
+
+    url = match.group(0).rstrip(_TRAILING_PUNCTUATION)
+
+    if "://" not in url:
+        url = "https://" + url
+
+    try:
+        parts = urlsplit(url)
+    except ValueError:
+        return None
+
+    return parts if parts.hostname else None
+
+
+def _host_matches(host, domain):
+    return host == domain or host.endswith("." + domain)
+
+
+# -------------------------
+# CANONICAL FORMS
+# -------------------------
+def canonical_coursera_url(raw):
+    """
+    One URL per certificate: verify / certificate / pdf links become
+    the verify page, records and share links keep their form, query
+    strings are dropped. None if it is not a certificate link.
+    """
+
+    parts = _split_url(raw)
+
+    if parts is None or not _host_matches(parts.hostname.lower(), "coursera.org"):
+        return None
+
+    path = parts.path
+
+    match = _COURSERA_VERIFY_RE.match(path)
+    if match:
+        cert_id = (match.group(1) or match.group(2)).upper()
+        return f"https://www.coursera.org/account/accomplishments/verify/{cert_id}"
+
+    match = _COURSERA_RECORDS_RE.match(path)
+    if match:
+        return f"https://www.coursera.org/account/accomplishments/records/{match.group(1).upper()}"
+
+    match = _COURSERA_SHARE_RE.match(path)
+    if match:
+        return f"https://coursera.org/share/{match.group(1).lower()}"
+
+    return None
+
+
+def canonical_linkedin_url(raw):
+    """LinkedIn post URL without tracking query / fragment, or None if not LinkedIn."""
+
+    parts = _split_url(raw)
+
+    if parts is None:
+        return None
+
+    host = parts.hostname.lower()
+
+    if not any(_host_matches(host, domain) for domain in _LINKEDIN_HOSTS):
+        return None
+
+    path = parts.path.rstrip("/")
+
+    if not path:
+        return None
+
+    if _host_matches(host, "linkedin.com"):
+        host = "www.linkedin.com"
+
+    return f"https://{host}{path}"